@@ -0,0 +1,101 @@
+"""
+Ad-hoc benchmarks of lineup response serialization, no database needed
+
+    poetry run python -m ffwrapped_be.app.benchmarks [repeat]
+"""
+
+import json
+import logging
+import statistics
+import sys
+import time
+from typing import Callable, Dict
+
+import numpy as np
+from pydantic import TypeAdapter
+
+from ffwrapped_be.app.main import _dump_lineups
+from ffwrapped_be.app.service.best_lineup import (
+    LineupResponse,
+    RosterPlayer,
+    get_best_season_lineups,
+    get_lineup_slots,
+    LeagueLineupSettings,
+)
+
+logger = logging.getLogger(__name__)
+
+LINEUP_CONFIG = {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "RB/WR/TE": 1, "BE": 7}
+ROSTER_POSITIONS = ["QB"] * 2 + ["RB"] * 5 + ["WR"] * 5 + ["TE"] * 2
+WEEKS = list(range(1, 18))
+
+
+def _season_lineups(seed: int = 0) -> Dict:
+    """
+    17-week actual lineups of a made-up roster, as the endpoints compute them
+    """
+    rng = np.random.default_rng(seed)
+    roster = [
+        RosterPlayer(name=f"Player {i}", id=1000 + i, position=position)
+        for i, position in enumerate(ROSTER_POSITIONS)
+    ]
+    shape = (len(roster), len(WEEKS))
+    return get_best_season_lineups(
+        LeagueLineupSettings(**LINEUP_CONFIG),
+        roster,
+        np.round(rng.uniform(0, 30, shape), 2),
+        WEEKS,
+        active=rng.random(shape) < 0.9,
+        rank=rng.random(shape) < 0.5,
+        slots=get_lineup_slots(LINEUP_CONFIG),
+    )
+
+
+def benchmark_serializer(
+    name: str, serialize: Callable[[], bytes], repeat: int
+) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = serialize()
+        timings.append(time.perf_counter() - start)
+
+    result = {
+        "bytes": len(body),
+        "best_ms": min(timings) * 1000,
+        "median_ms": statistics.median(timings) * 1000,
+    }
+    logger.info(
+        f"{name}: {result['bytes']} bytes, best {result['best_ms']:.3f}ms, "
+        f"median {result['median_ms']:.3f}ms"
+    )
+    return result
+
+
+def benchmark_lineup_serialization(repeat: int = 200) -> None:
+    """
+    Compares ways of turning one team's 17-week lineups into a response body
+    """
+    lineups = _season_lineups()
+    response_model = TypeAdapter(Dict[int, LineupResponse])
+
+    def via_response_model() -> bytes:
+        # What FastAPI does with `response_model`: validate, dump, then stdlib json
+        content = response_model.dump_python(
+            response_model.validate_python(lineups), mode="json", exclude_unset=True
+        )
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+    slow = benchmark_serializer("response_model", via_response_model, repeat)
+    fast = benchmark_serializer("orjson", lambda: _dump_lineups(lineups), repeat)
+    if json.loads(via_response_model()) != json.loads(_dump_lineups(lineups)):
+        logger.error("orjson body differs from the response_model body")
+    logger.info(
+        f"orjson is {slow['median_ms'] / max(fast['median_ms'], 1e-9):.0f}x faster "
+        f"than response_model per 17-week response"
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    benchmark_lineup_serialization(*(int(arg) for arg in sys.argv[1:2]))
@@ -1,9 +1,13 @@
 from sqlalchemy import (
+    TIMESTAMP,
     Column,
     Integer,
     String,
     ForeignKey,
     Date,
+    Float,
+    Index,
+    func,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base, relationship
@@ -43,7 +47,10 @@ class PlayerSeason(Base):
     def espn_weeks_dict(self):
         return {week.week: week for week in self.weeks}
 
-    __table_args__ = (UniqueConstraint("player_id", "season"),)
+    __table_args__ = (
+        UniqueConstraint("player_id", "season"),
+        Index("ix_player_season_season_player_id", "season", "player_id"),
+    )
 
 
 class Team(Base):
@@ -171,6 +178,8 @@ class LeagueSeason(Base):
     season = Column(Integer, nullable=False)
     lineup_config = Column(JSONB)
     scoring_config = Column(JSONB)
+    # Bumped whenever ETL changes data behind the league's lineups
+    data_version = Column(Integer, nullable=False, server_default="0")
     league_teams = relationship("LeagueTeam", backref="season")
 
     __table_args__ = (UniqueConstraint("platform_id", "platform_league_id", "season"),)
@@ -213,3 +222,28 @@ class LeagueWeeklyTeam(Base):
     player_week = relationship(
         "PlayerWeekESPN", back_populates="league_weekly_team", lazy="joined"
     )
+
+
+class LeaguePlayerWeekPoints(Base):
+    __tablename__ = "league_player_week_points"
+    league_season_id = Column(
+        Integer, ForeignKey("league_season.league_season_id"), primary_key=True
+    )
+    player_week_id = Column(
+        Integer, ForeignKey("player_week_espn.player_week_id"), primary_key=True
+    )
+    points = Column(Float, nullable=False)
+    points_breakdown = Column(JSONB)
+    scoring_config_hash = Column(String(64), nullable=False)
+
+
+class LeagueWeekWatermark(Base):
+    __tablename__ = "league_week_watermark"
+    league_season_id = Column(
+        Integer, ForeignKey("league_season.league_season_id"), primary_key=True
+    )
+    # Which weekly load, e.g. "player_week" or "weekly_starters"
+    dataset = Column(String(50), primary_key=True)
+    # Last completed week the load has loaded, later weeks still need loading
+    week = Column(Integer, nullable=False)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
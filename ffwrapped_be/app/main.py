@@ -1,22 +1,41 @@
+import asyncio
 from collections import defaultdict
+from contextlib import asynccontextmanager
 import logging
-import cachetools
-from typing import List, Optional, Dict
-from fastapi import FastAPI, Depends, Query
+import numpy as np
+from typing import Awaitable, Callable, List, Optional, Dict
+from fastapi import FastAPI, Depends, Query, Request, Response
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 from ffwrapped_be.db import databases as db
-from ffwrapped_be.db.databases import get_db
-from ffwrapped_be.etl import utils
+from ffwrapped_be.db.databases import get_async_db
 from ffwrapped_be.config import config
+from ffwrapped_be.app.service import (
+    scoring,
+    league_plan,
+    response_cache,
+    season_store,
+)
+from ffwrapped_be.app.service.league_plan import LeaguePlan
 from ffwrapped_be.app.service.best_lineup import (
     LeagueLineupSettings,
     Player,
-    get_best_weekly_lineup,
+    RosterPlayer,
+    get_best_season_lineups,
+    LineupDict,
     LineupResponse,
+    TeamLineupsResponse,
 )
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await season_store.load_season_stores()
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -25,7 +44,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-cache = cachetools.LRUCache(maxsize=128)
+SEASON_WEEKS = list(range(1, 18))
 
 
 @app.get("/")
@@ -33,76 +52,281 @@ def read_root():
     return {"Hello": "World"}
 
 
+@app.get("/metrics/db-pools")
+def get_db_pool_stats():
+    """
+    Connection pool usage of this worker process, to size Postgres connections
+    """
+    return db.get_pool_stats()
+
+
+@app.get("/metrics/lineups")
+def get_lineup_stats():
+    """
+    Cache hits, computations and coalesced lineup requests of this worker process
+    """
+    return response_cache.get_stats()
+
+
+@app.get("/metrics/season-store")
+def get_season_store_memory():
+    """
+    Memory held by the in-memory season stores of this worker process
+    """
+    return season_store.get_memory_report()
+
+
+@app.post("/season-store/{season}/refresh")
+async def refresh_season_store(
+    season: int, db_session: AsyncSession = Depends(get_async_db)
+):
+    """
+    Reloads a season into this worker's memory, e.g. right after an ETL run
+    - Other workers pick up the change on their next data version check
+    """
+    await season_store.load_season_store(season, db_session)
+    return season_store.get_memory_report()
+
+
 def update_weekly_stat_names():
     update_dict = {"receptions": "rec", "fumbles": "fum_lost"}
     for key, value in update_dict.items():
         print(key, value)
 
 
+async def _score_season(
+    weeks_by_player: List[Dict],
+    weeks: List[int],
+    plan: LeaguePlan,
+    db_session: AsyncSession,
+    store: Optional[season_store.SeasonStore] = None,
+) -> np.ndarray:
+    """
+    Returns a (players, weeks) matrix of fantasy points
+    - Reads materialized points where current, and scores the remaining player weeks
+    - Stats of those come from the season store if given, else from the rows
+    - Scoring runs in a worker thread, off the event loop
+    """
+    player_week_ids = [
+        player_weeks[week].player_week_id
+        for player_weeks in weeks_by_player
+        for week in weeks
+        if week in player_weeks
+    ]
+    materialized_points = await db.get_league_player_week_points_async(
+        plan.league_season_id, player_week_ids, plan.scoring_config_hash, db_session
+    )
+    return await asyncio.to_thread(
+        _season_points, weeks_by_player, weeks, plan, materialized_points, store
+    )
+
+
+def _season_points(
+    weeks_by_player: List[Dict],
+    weeks: List[int],
+    plan: LeaguePlan,
+    materialized_points: Dict[int, float],
+    store: Optional[season_store.SeasonStore],
+) -> np.ndarray:
+    season_points = np.zeros((len(weeks_by_player), len(weeks)))
+    unscored = []
+    for player_index, player_weeks in enumerate(weeks_by_player):
+        for week_index, week in enumerate(weeks):
+            player_week = player_weeks.get(week)
+            if player_week is None:
+                continue
+            if player_week.player_week_id in materialized_points:
+                season_points[player_index, week_index] = materialized_points[
+                    player_week.player_week_id
+                ]
+            else:
+                unscored.append((player_index, week_index, player_week))
+
+    if unscored:
+        logger.info(f"Scoring {len(unscored)} player weeks without materialized points")
+        player_indices, week_indices, player_weeks = zip(*unscored)
+        if store:
+            stats = store.week_stats(
+                [pw.player_season_id for pw in player_weeks],
+                [pw.week for pw in player_weeks],
+            )
+        else:
+            stats = np.nan_to_num(
+                np.array(
+                    [scoring.player_week_stats(pw) for pw in player_weeks],
+                    dtype=np.float64,
+                )
+            )
+        season_points[player_indices, week_indices] = scoring.score_stat_matrix(
+            stats, plan.scoring_weights
+        )
+    return season_points
+
+
+def _requested_weeks(week: Optional[int]) -> List[int]:
+    return [week] if week else SEASON_WEEKS
+
+
+def _group_player_weeks(rows: List) -> tuple[List[RosterPlayer], List[Dict]]:
+    """
+    Groups lean lineup rows by player, in the order players first appear
+    Returns the roster and a {week: row} dict for each roster player
+    """
+    players: Dict[int, tuple] = {}
+    for row in rows:
+        if row.player_id not in players:
+            roster_player = RosterPlayer(
+                name=row.first_name + " " + row.last_name,
+                id=row.player_id,
+                position=row.position,
+            )
+            players[row.player_id] = (roster_player, {})
+        if row.player_week_id is not None:
+            players[row.player_id][1][row.week] = row
+    roster = [roster_player for roster_player, _ in players.values()]
+    weeks_by_player = [player_weeks for _, player_weeks in players.values()]
+    return roster, weeks_by_player
+
+
+def _validate_drafted_players(
+    roster: List[RosterPlayer], weeks_by_player: List[Dict], week: Optional[int]
+) -> None:
+    for player, player_weeks in zip(roster, weeks_by_player):
+        if player.position is None:
+            logger.error(f"Player {player.id} has no player_seasons")
+            raise Exception(f"Player {player.id} has no player_seasons")
+        # A single requested week can legitimately be missing, e.g. a bye week
+        if not player_weeks and week is None:
+            logger.error(f"Player {player.id} has no player_weeks")
+            raise Exception(f"Player {player.id} has no player_weeks")
+
+
+def _weekly_team_membership(
+    weeks_by_player: List[Dict], weeks: List[int]
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Takes the grouped weekly lineup rows of a single team
+    Returns (players, weeks) matrices of whether each player was on the team that
+    week, and whether they were in its starting lineup
+    """
+    on_team = np.zeros((len(weeks_by_player), len(weeks)), dtype=bool)
+    started = np.zeros(on_team.shape)
+    for player_index, player_weeks in enumerate(weeks_by_player):
+        for week_index, week in enumerate(weeks):
+            player_week = player_weeks.get(week, None)
+            if not player_week:
+                continue
+            on_team[player_index, week_index] = True
+            started[player_index, week_index] = player_week.lineup_position not in [
+                "BE",
+                "IR",
+            ]
+    return on_team, started
+
+
+def _dump_lineups(lineups: Dict) -> bytes:
+    """
+    Serializes the solver's plain-dict lineups (see `get_best_season_lineups`) as is
+    - They're built from trusted matrices, so the response models aren't re-validated
+    """
+    return orjson.dumps(lineups, option=orjson.OPT_NON_STR_KEYS)
+
+
+async def _cached_lineup_response(
+    request: Request,
+    league_id: str,
+    endpoint: str,
+    params: tuple,
+    compute: Callable[[AsyncSession, Optional[season_store.SeasonStore]], Awaitable],
+    db_session: AsyncSession,
+) -> Response:
+    """
+    Serves a lineup response keyed on (endpoint, league, params, season, the
+    league's data version)
+    - Answers 304 when the client's If-None-Match is still current
+    - Otherwise serves the cached body, computing and caching it on a miss
+    - A shared computation can outlive the request that started it, so it runs on
+      its own session rather than the request's `db_session`
+    - The season store is checked for changes on its own clock, so the key also
+      carries the version of the store the computation is handed
+    """
+    data_version = await response_cache.get_data_version(league_id, 2024, db_session)
+    store = await season_store.get_season_store(2024, db_session)
+    if data_version is None:
+        body = _dump_lineups(await compute(db_session, store))
+        return Response(body, media_type="application/json")
+
+    store_version = store.data_version if store else None
+    key = (endpoint, str(league_id), *params, 2024, data_version, store_version)
+    etag = response_cache.etag(key)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if response_cache.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    async def serialize() -> bytes:
+        async with db.AsyncSessionLocal() as flight_session:
+            return _dump_lineups(await compute(flight_session, store))
+
+    body = await response_cache.get_or_compute_response(key, serialize)
+    return Response(body, media_type="application/json", headers=headers)
+
+
 @app.get(
     "/leagues/{league_id}/teams/lineups/best-drafted",
     response_model=Dict[int, LineupResponse],
     response_model_exclude_unset=True,
 )
-def get_best_lineup_drafted(
+async def get_best_lineup_drafted(
+    request: Request,
     league_id: str,
     teamId: int = Query(..., alias="teamId"),
     week: Optional[int] = Query(None, alias="week"),
-    db_session: Session = Depends(get_db),
+    db_session: AsyncSession = Depends(get_async_db),
 ):
-    league = db.get_league_season_by_platform_league_id(league_id, 2024, db_session)
-    league_lineup = LeagueLineupSettings(**league.lineup_config)
-    scoring_config = league.scoring_config
+    return await _cached_lineup_response(
+        request,
+        league_id,
+        "best-drafted",
+        (teamId, week),
+        lambda db_session, store: _best_drafted_lineups(
+            league_id, teamId, week, db_session, store
+        ),
+        db_session,
+    )
+
+
+async def _best_drafted_lineups(
+    league_id: str,
+    teamId: int,
+    week: Optional[int],
+    db_session: AsyncSession,
+    store: Optional[season_store.SeasonStore],
+) -> Dict[int, LineupDict]:
+    plan = await league_plan.get_league_plan_async(league_id, 2024, db_session)
+    weeks = _requested_weeks(week)
 
     # Get the ESPN-based player_week rows for the team
-    players = db.get_draft_team_players(league_id, str(teamId), 2024, db_session)
-    for player in players:
-        # TODO: Include D/ST and K to draft team
-        if not player.seasons:
-            logger.error(f"Player {player.player_id} has no player_seasons")
-            raise Exception(f"Player {player.player_id} has no player_seasons")
-        if not player.seasons[0].espn_weeks_dict:
-            logger.error(f"Player {player.player_id} has no player_weeks")
-            raise Exception(f"Player {player.player_id} has no player_weeks")
-
-    bestLineupResponses: Dict[int, LineupResponse] = {}
-    for week in range(1, 18):
-        new_players: List[Player] = []
-        for player in players:
-            points = 0
-            player_season = player.seasons[0]
-            player_week = player_season.espn_weeks_dict.get(week, None)
-            if player_week:
-                newDict = {
-                    utils.DB_PLAYER_STATS_TO_ESPN.get(k, k): v
-                    for k, v in vars(player_week).items()
-                    if v is not None
-                }
-                newDict = utils.generate_derived_espn_statistics(newDict)
-                newDict = {
-                    utils.ESPN_PLAYER_STATS_TO_SCORING_CONFIG.get(k, k): v
-                    for k, v in newDict.items()
-                    if v is not None
-                }
-                for k, v in newDict.items():
-                    if k in scoring_config.keys():
-                        points += v * scoring_config[k]
-            else:
-                logger.info(
-                    f"{player.first_name} {player.last_name} has no player_week for week: {week}. Moving to next player"
-                )
-            new_players.append(
-                Player(
-                    name=player.first_name + " " + player.last_name,
-                    id=player.player_id,
-                    position=player_season.position,
-                    points=round(points, 2),
-                )
-            )
-        bestLineupResponses[int(week)] = get_best_weekly_lineup(
-            league_lineup, new_players, week
-        )
-    return bestLineupResponses
+    # TODO: Include D/ST and K to draft team
+    rows = await db.get_draft_lineup_rows_async(
+        league_id,
+        2024,
+        db_session,
+        platform_team_id=str(teamId),
+        week=week,
+        with_stats=store is None,
+    )
+    roster, weeks_by_player = _group_player_weeks(rows)
+    _validate_drafted_players(roster, weeks_by_player, week)
+
+    season_points = await _score_season(weeks_by_player, weeks, plan, db_session, store)
+    return await asyncio.to_thread(
+        get_best_season_lineups,
+        plan.league_lineup,
+        roster,
+        season_points,
+        weeks,
+        slots=plan.lineup_slots,
+    )
 
 
 @app.get(
@@ -110,74 +334,56 @@ def get_best_lineup_drafted(
     response_model=Dict[int, LineupResponse],
     response_model_exclude_unset=True,
 )
-def get_actual_lineup(
+async def get_actual_lineup(
+    request: Request,
     league_id: str,
     teamId: int = Query(..., alias="teamId"),
     week: Optional[int] = Query(None, alias="week"),
-    db_session: Session = Depends(get_db),
+    db_session: AsyncSession = Depends(get_async_db),
 ):
-    league = db.get_league_season_by_platform_league_id(league_id, 2024, db_session)
-    league_lineup = LeagueLineupSettings(**league.lineup_config)
-    scoring_config = league.scoring_config
-
-    weekly_players = db.get_weekly_team_players(
-        league_id, str(teamId), 2024, db_session
-    )
-    for player in weekly_players:
-        if not player.seasons:
-            logger.error(f"Player {player.player_id} has no player_seasons")
-            raise Exception(f"Player {player.player_id} has no player_seasons")
-        if not player.seasons[0].espn_weeks_dict:
-            logger.error(f"Player {player.player_id} has no player_weeks")
-            raise Exception(f"Player {player.player_id} has no player_weeks")
-
-    actualLineupResponses: Dict[int, LineupResponse] = {}
-    for week in range(1, 18):
-        new_players: List[Player] = []
-        for player in weekly_players:
-            points = 0
-            player_season = player.seasons[0]
-            player_week = player_season.espn_weeks_dict.get(week, None)
-            if (
-                not player_week
-                or not player_week.league_weekly_team
-                or player_week.league_weekly_team[0].league_team.platform_team_id
-                != str(teamId)
-            ):
-                logger.info(
-                    f"{player.first_name} {player.last_name} has no player_week or league_weekly_team for week: {week}."
-                )
-                continue
-            league_weekly_team = player_week.league_weekly_team
-            newDict = {
-                utils.DB_PLAYER_STATS_TO_ESPN.get(k, k): v
-                for k, v in vars(player_week).items()
-                if v is not None
-            }
-            newDict = utils.generate_derived_espn_statistics(newDict)
-            newDict = {
-                utils.ESPN_PLAYER_STATS_TO_SCORING_CONFIG.get(k, k): v
-                for k, v in newDict.items()
-                if v is not None
-            }
-            for k, v in newDict.items():
-                if k in scoring_config.keys():
-                    points += v * scoring_config[k]
-
-            new_players.append(
-                Player(
-                    name=player.first_name + " " + player.last_name,
-                    id=player.player_id,
-                    position=player_season.position,
-                    points=round(points, 2),
-                    rank=league_weekly_team[0].lineup_position not in ["BE", "IR"],
-                )
-            )
-        actualLineupResponses[int(week)] = get_best_weekly_lineup(
-            league_lineup, new_players, week, sortby=["rank", "points"]
-        )
+    return await _cached_lineup_response(
+        request,
+        league_id,
+        "actual",
+        (teamId, week),
+        lambda db_session, store: _actual_lineups(
+            league_id, teamId, week, db_session, store
+        ),
+        db_session,
+    )
+
 
-    return actualLineupResponses
+async def _actual_lineups(
+    league_id: str,
+    teamId: int,
+    week: Optional[int],
+    db_session: AsyncSession,
+    store: Optional[season_store.SeasonStore],
+) -> Dict[int, LineupDict]:
+    plan = await league_plan.get_league_plan_async(league_id, 2024, db_session)
+    weeks = _requested_weeks(week)
+
+    rows = await db.get_weekly_lineup_rows_async(
+        league_id,
+        2024,
+        db_session,
+        platform_team_id=str(teamId),
+        week=week,
+        with_stats=store is None,
+    )
+    roster, weeks_by_player = _group_player_weeks(rows)
+    on_team, started = _weekly_team_membership(weeks_by_player, weeks)
+    season_points = await _score_season(weeks_by_player, weeks, plan, db_session, store)
+    return await asyncio.to_thread(
+        get_best_season_lineups,
+        plan.league_lineup,
+        roster,
+        season_points,
+        weeks,
+        active=on_team,
+        rank=started,
+        slots=plan.lineup_slots,
+    )
 
 
 @app.get(
@@ -185,67 +391,177 @@ def get_actual_lineup(
     response_model=Dict[int, LineupResponse],
     response_model_exclude_unset=True,
 )
-def get_best_possible_lineup(
+async def get_best_possible_lineup(
+    request: Request,
     league_id: str,
     teamId: int = Query(..., alias="teamId"),
     week: Optional[int] = Query(None, alias="week"),
-    db_session: Session = Depends(get_db),
+    db_session: AsyncSession = Depends(get_async_db),
 ):
-    league = db.get_league_season_by_platform_league_id(league_id, 2024, db_session)
-    league_lineup = LeagueLineupSettings(**league.lineup_config)
-    scoring_config = league.scoring_config
-
-    weekly_players = db.get_weekly_team_players(
-        league_id, str(teamId), 2024, db_session
-    )
-    for player in weekly_players:
-        if not player.seasons:
-            logger.error(f"Player {player.player_id} has no player_seasons")
-            raise Exception(f"Player {player.player_id} has no player_seasons")
-        if not player.seasons[0].espn_weeks_dict:
-            logger.error(f"Player {player.player_id} has no player_weeks")
-            raise Exception(f"Player {player.player_id} has no player_weeks")
-
-    bestLineupResponses: Dict[int, LineupResponse] = {}
-    for week in range(1, 18):
-        new_players: List[Player] = []
-        for player in weekly_players:
-            points = 0
-            player_season = player.seasons[0]
-            player_week = player_season.espn_weeks_dict.get(week, None)
-            if (
-                not player_week
-                or not player_week.league_weekly_team
-                or player_week.league_weekly_team[0].league_team.platform_team_id
-                != str(teamId)
-            ):
-                logger.info(
-                    f"{player.first_name} {player.last_name} has no player_week or league_weekly_team for week: {week}."
-                )
-                continue
-            newDict = {
-                utils.DB_PLAYER_STATS_TO_ESPN.get(k, k): v
-                for k, v in vars(player_week).items()
-                if v is not None
-            }
-            newDict = utils.generate_derived_espn_statistics(newDict)
-            newDict = {
-                utils.ESPN_PLAYER_STATS_TO_SCORING_CONFIG.get(k, k): v
-                for k, v in newDict.items()
-                if v is not None
-            }
-            for k, v in newDict.items():
-                if k in scoring_config.keys():
-                    points += v * scoring_config[k]
-            new_players.append(
-                Player(
-                    name=player.first_name + " " + player.last_name,
-                    id=player.player_id,
-                    position=player_season.position,
-                    points=round(points, 2),
-                )
-            )
-        bestLineupResponses[int(week)] = get_best_weekly_lineup(
-            league_lineup, new_players, week
+    return await _cached_lineup_response(
+        request,
+        league_id,
+        "best-actual",
+        (teamId, week),
+        lambda db_session, store: _best_actual_lineups(
+            league_id, teamId, week, db_session, store
+        ),
+        db_session,
+    )
+
+
+async def _best_actual_lineups(
+    league_id: str,
+    teamId: int,
+    week: Optional[int],
+    db_session: AsyncSession,
+    store: Optional[season_store.SeasonStore],
+) -> Dict[int, LineupDict]:
+    plan = await league_plan.get_league_plan_async(league_id, 2024, db_session)
+    weeks = _requested_weeks(week)
+
+    rows = await db.get_weekly_lineup_rows_async(
+        league_id,
+        2024,
+        db_session,
+        platform_team_id=str(teamId),
+        week=week,
+        with_stats=store is None,
+    )
+    roster, weeks_by_player = _group_player_weeks(rows)
+    on_team, _ = _weekly_team_membership(weeks_by_player, weeks)
+    season_points = await _score_season(weeks_by_player, weeks, plan, db_session, store)
+    return await asyncio.to_thread(
+        get_best_season_lineups,
+        plan.league_lineup,
+        roster,
+        season_points,
+        weeks,
+        active=on_team,
+        slots=plan.lineup_slots,
+    )
+
+
+@app.get(
+    "/leagues/{league_id}/lineups",
+    response_model=Dict[str, TeamLineupsResponse],
+    response_model_exclude_unset=True,
+)
+async def get_league_lineups(
+    request: Request,
+    league_id: str,
+    week: Optional[int] = Query(None, alias="week"),
+    db_session: AsyncSession = Depends(get_async_db),
+):
+    """
+    Drafted-best, actual and best-actual lineups of every team in the league
+    """
+    return await _cached_lineup_response(
+        request,
+        league_id,
+        "league",
+        (week,),
+        lambda db_session, store: _league_lineups(league_id, week, db_session, store),
+        db_session,
+    )
+
+
+async def _league_lineups(
+    league_id: str,
+    week: Optional[int],
+    db_session: AsyncSession,
+    store: Optional[season_store.SeasonStore],
+) -> Dict[str, Dict[str, Dict[int, LineupDict]]]:
+    """
+    - Loads all teams' players with one set of queries
+    - Scores each player once, however many teams they were on
+    """
+    plan = await league_plan.get_league_plan_async(league_id, 2024, db_session)
+    weeks = _requested_weeks(week)
+
+    league_teams = await db.get_league_teams_async(plan.league_season_id, db_session)
+    draft_rows = await db.get_draft_lineup_rows_async(
+        league_id, 2024, db_session, week=week, with_stats=store is None
+    )
+    weekly_rows = await db.get_weekly_lineup_rows_async(
+        league_id, 2024, db_session, week=week, with_stats=store is None
+    )
+
+    league_roster, league_weeks_by_player = _group_player_weeks(
+        draft_rows + weekly_rows
+    )
+    player_rows = {player.id: row for row, player in enumerate(league_roster)}
+    season_points = await _score_season(
+        league_weeks_by_player, weeks, plan, db_session, store
+    )
+
+    # The solver runs every team x 3 lineups, so it's kept off the event loop
+    return await asyncio.to_thread(
+        _solve_league_lineups,
+        plan,
+        weeks,
+        week,
+        league_teams,
+        draft_rows,
+        weekly_rows,
+        player_rows,
+        season_points,
+    )
+
+
+def _solve_league_lineups(
+    plan: LeaguePlan,
+    weeks: List[int],
+    week: Optional[int],
+    league_teams: List,
+    draft_rows: List,
+    weekly_rows: List,
+    player_rows: Dict[int, int],
+    season_points: np.ndarray,
+) -> Dict[str, Dict[str, Dict[int, LineupDict]]]:
+    draft_rows_by_team, weekly_rows_by_team = defaultdict(list), defaultdict(list)
+    for row in draft_rows:
+        draft_rows_by_team[row.platform_team_id].append(row)
+    for row in weekly_rows:
+        weekly_rows_by_team[row.platform_team_id].append(row)
+
+    league_lineups = {}
+    for league_team in league_teams:
+        platform_team_id = league_team.platform_team_id
+        drafted, drafted_weeks = _group_player_weeks(
+            draft_rows_by_team[platform_team_id]
+        )
+        _validate_drafted_players(drafted, drafted_weeks, week)
+        weekly, weekly_weeks = _group_player_weeks(
+            weekly_rows_by_team[platform_team_id]
+        )
+        on_team, started = _weekly_team_membership(weekly_weeks, weeks)
+        weekly_points = season_points[[player_rows[player.id] for player in weekly]]
+
+        league_lineups[platform_team_id] = dict(
+            best_drafted=get_best_season_lineups(
+                plan.league_lineup,
+                drafted,
+                season_points[[player_rows[player.id] for player in drafted]],
+                weeks,
+                slots=plan.lineup_slots,
+            ),
+            actual=get_best_season_lineups(
+                plan.league_lineup,
+                weekly,
+                weekly_points,
+                weeks,
+                active=on_team,
+                rank=started,
+                slots=plan.lineup_slots,
+            ),
+            best_actual=get_best_season_lineups(
+                plan.league_lineup,
+                weekly,
+                weekly_points,
+                weeks,
+                active=on_team,
+                slots=plan.lineup_slots,
+            ),
         )
-    return bestLineupResponses
+    return league_lineups
@@ -1,6 +1,7 @@
 import logging
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, NamedTuple
 from collections import defaultdict
+import numpy as np
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
@@ -33,6 +34,16 @@ class ESPNPlayer(Player):
     espn_id: int = Field(description="Player's ESPN ID")
 
 
+class RosterPlayer(NamedTuple):
+    """
+    Week-independent info for a row of a roster's (players, weeks) points matrix
+    """
+
+    name: str
+    id: Optional[int]
+    position: str
+
+
 # ========
 # Response models
 # ========
@@ -41,49 +52,14 @@ class LineupResponse(BaseModel):
     bench: Dict[str, List[Player]]
 
 
-def _assemble_sorted_position_groups(
-    players: List[Player], sortby: List[str]
-) -> Dict[str, List[Player]]:
-    position_groups = defaultdict(list)
-    for player in players:
-        position_groups[player.position].append(player)
-
-    for position in position_groups:
-        position_groups[position].sort(
-            key=lambda player: tuple(getattr(player, attr) for attr in sortby),
-            reverse=True,
-        )
-    return position_groups
-
-
-def _assemble_sorted_flex_group(
-    flex_position_name: str,
-    position_groups: Dict[str, List[Player]],
-    sortby: List[str],
-) -> List[Player]:
-    flex_positions = [i.strip() for i in flex_position_name.split("/")]
-    logger.debug("Here are flex positions: %s", flex_positions)
-    eligible_players = []
-    for flex_position in flex_positions:
-        eligible_players.extend(position_groups.get(flex_position, []))
-
-    eligible_players.sort(
-        key=lambda player: tuple(getattr(player, attr) for attr in sortby),
-        reverse=True,
-    )
-    return eligible_players
+class TeamLineupsResponse(BaseModel):
+    best_drafted: Dict[int, LineupResponse]
+    actual: Dict[int, LineupResponse]
+    best_actual: Dict[int, LineupResponse]
 
 
-def _get_flex_positions(
-    league_lineup_dict: Dict[str, int], sorted_position_groups: Dict[str, List[Player]]
-) -> List[str]:
-    return [
-        position
-        for position in league_lineup_dict.keys()
-        if "/" in position
-        and league_lineup_dict[position] > 0
-        and position not in ["QB", "RB", "WR", "TE", "D/ST", "K"]
-    ]
+# `LineupResponse` as a plain dict, see `get_best_season_lineups`
+LineupDict = Dict[str, Dict[str, List[Dict[str, Any]]]]
 
 
 def reorder_dict(
@@ -99,44 +75,296 @@ def reorder_dict(
     return {key: original_dict[key] for key in desired_order if key in original_dict}
 
 
-def get_best_weekly_lineup(
+# Positions left out of lineups until we have D/ST and K data everywhere (i.e., DB)
+EXCLUDED_POSITIONS = ["D/ST", "K"]
+NON_STARTING_SLOTS = ["BE", "IR", ""]
+
+# Positions accepted by ESPN lineup slots that aren't named after a single position
+SLOT_ELIGIBLE_POSITIONS = {
+    "RB/WR": ("RB", "WR"),
+    "WR/TE": ("WR", "TE"),
+    "RB/WR/TE": ("RB", "WR", "TE"),
+    "OP": ("QB", "RB", "WR", "TE"),
+    "DL": ("DT", "DE"),
+    "DB": ("CB", "S"),
+    "DP": ("DT", "DE", "LB", "CB", "S"),
+}
+
+# Order of slots and positions in lineup responses
+LINEUP_ORDER = (
+    ["QB", "TQB", "RB", "WR", "TE"]
+    + [f"FLEX-{i}" for i in range(1, 6)]
+    + ["OP", "DT", "DE", "LB", "DL", "CB", "S", "DB", "DP", "D/ST", "K", "P", "HC"]
+)
+
+
+class LineupSlot(NamedTuple):
+    """
+    A starting slot type from a league's lineup config, e.g. 2 x RB/WR/TE
+    """
+
+    key: str  # Name in the lineup config
+    name: str  # Name in lineup responses, e.g. FLEX-1
+    count: int
+    eligible_positions: tuple
+
+
+def get_lineup_slots(league_lineup_dict: Dict[str, int]) -> List[LineupSlot]:
+    slots = []
+    flex_position_number = 0
+    for slot_key, count in league_lineup_dict.items():
+        if not count or slot_key in NON_STARTING_SLOTS:
+            continue
+        eligible_positions = SLOT_ELIGIBLE_POSITIONS.get(slot_key, (slot_key,))
+        slot_name = slot_key
+        if "/" in slot_key and slot_key not in EXCLUDED_POSITIONS:
+            if slot_key not in SLOT_ELIGIBLE_POSITIONS:
+                eligible_positions = tuple(i.strip() for i in slot_key.split("/"))
+            flex_position_number += 1
+            slot_name = f"FLEX-{flex_position_number}"
+        slots.append(LineupSlot(slot_key, slot_name, count, eligible_positions))
+    return slots
+
+
+def _is_greedy_layout(slots: List[LineupSlot]) -> bool:
+    """
+    Filling single-position slots first, then the one flex slot from what's left, is
+    only optimal when at most one slot type accepts several positions
+    """
+    return sum(len(slot.eligible_positions) > 1 for slot in slots) <= 1
+
+
+def _sorted_player_order(
+    points: np.ndarray, rank: np.ndarray, eligible: np.ndarray, *tiebreaks
+) -> np.ndarray:
+    """
+    Returns a (players, weeks) matrix whose columns are player indices sorted by
+    (eligible, rank, points) descending, falling back to `tiebreaks` then player index
+    """
+    player_index = np.broadcast_to(np.arange(points.shape[0])[:, None], points.shape)
+    keys = (player_index,) + tuple(reversed(tiebreaks)) + (-points, -rank, ~eligible)
+    return np.lexsort(keys, axis=0)
+
+
+def _take_top(order: np.ndarray, eligible: np.ndarray, count: int) -> np.ndarray:
+    """
+    Returns a (players, weeks) mask of the first `count` eligible players of each
+    week, following `order`
+    """
+    weeks = np.arange(order.shape[1])
+    sorted_eligible = eligible[order, weeks]
+    sorted_taken = sorted_eligible & (np.cumsum(sorted_eligible, axis=0) <= count)
+    taken = np.zeros_like(eligible)
+    taken[order, weeks] = sorted_taken
+    return taken
+
+
+def _fill_slots_greedy(
+    slots: List[LineupSlot],
+    positions: np.ndarray,
+    points: np.ndarray,
+    rank: np.ndarray,
+    active: np.ndarray,
+    order: np.ndarray,
+) -> tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """
+    Fills every week at once: single-position slots with the best players of that
+    position, then the flex slot with the best players left in its pool
+    """
+    starters_by_slot: Dict[str, np.ndarray] = {}
+    slot_orders: Dict[str, np.ndarray] = {}
+    started = np.zeros(points.shape, dtype=bool)
+    flex_slots = [slot for slot in slots if len(slot.eligible_positions) > 1]
+    for slot in [slot for slot in slots if slot not in flex_slots]:
+        eligible = active & (positions == slot.eligible_positions[0])[:, None]
+        starters_by_slot[slot.name] = _take_top(order, eligible, slot.count)
+        slot_orders[slot.name] = order
+        started |= starters_by_slot[slot.name]
+
+    for slot in flex_slots:
+        pool = slot.eligible_positions
+        pool_index = np.array(
+            [pool.index(p) if p in pool else len(pool) for p in positions]
+        )
+        eligible = active & ~started & (pool_index < len(pool))[:, None]
+        flex_order = _sorted_player_order(
+            points,
+            rank,
+            eligible,
+            np.broadcast_to(pool_index[:, None], points.shape),
+        )
+        starters_by_slot[slot.name] = _take_top(flex_order, eligible, slot.count)
+        slot_orders[slot.name] = flex_order
+        started |= starters_by_slot[slot.name]
+    return starters_by_slot, slot_orders
+
+
+def assign_lineup_slots(
+    slots: List[LineupSlot], positions: List[str], player_order: List[int]
+) -> List[List[int]]:
+    """
+    Exact optimal assignment of players to slots, for any slot layout
+
+    The sets of players that can start together form a transversal matroid, so
+    taking players best-first and keeping each one that still fits (moving earlier
+    picks between slots along an augmenting path if needed) maximizes the lineup.
+    Each pick costs one search over slot types, bounded by the number of starters.
+
+    :param positions: Position of each player index.
+    :param player_order: Indices of the available players, best first.
+    :return: Player indices assigned to each slot, in `slots` order.
+    """
+    # Try the most specific slots first, so flex slots stay open for later picks
+    slots_by_position: Dict[str, List[int]] = defaultdict(list)
+    for slot_index in sorted(
+        range(len(slots)), key=lambda i: len(slots[i].eligible_positions)
+    ):
+        for position in slots[slot_index].eligible_positions:
+            slots_by_position[position].append(slot_index)
+
+    assigned: List[List[int]] = [[] for _ in slots]
+
+    def augment(player_index: int, visited: set) -> bool:
+        for slot_index in slots_by_position.get(positions[player_index], []):
+            if slot_index in visited:
+                continue
+            visited.add(slot_index)
+            if len(assigned[slot_index]) < slots[slot_index].count:
+                assigned[slot_index].append(player_index)
+                return True
+            for other_index in assigned[slot_index]:
+                if augment(other_index, visited):
+                    assigned[slot_index].remove(other_index)
+                    assigned[slot_index].append(player_index)
+                    return True
+        return False
+
+    open_slots = sum(slot.count for slot in slots)
+    for player_index in player_order:
+        if not open_slots:
+            break
+        if augment(player_index, set()):
+            open_slots -= 1
+
+    rank_in_order = {player_index: i for i, player_index in enumerate(player_order)}
+    return [sorted(players, key=rank_in_order.get) for players in assigned]
+
+
+def _fill_slots_exact(
+    slots: List[LineupSlot],
+    positions: np.ndarray,
+    active: np.ndarray,
+    order: np.ndarray,
+) -> tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    starters_by_slot = {slot.name: np.zeros(active.shape, dtype=bool) for slot in slots}
+    position_list = positions.tolist()
+    for week_index in range(active.shape[1]):
+        week_order = [i for i in order[:, week_index] if active[i, week_index]]
+        assigned = assign_lineup_slots(slots, position_list, week_order)
+        for slot, player_indices in zip(slots, assigned):
+            starters_by_slot[slot.name][player_indices, week_index] = True
+    return starters_by_slot, {slot.name: order for slot in slots}
+
+
+def _player_entry(
+    roster_player: RosterPlayer, points: float, rank: Optional[int] = None
+) -> Dict[str, Any]:
+    entry = {
+        "name": roster_player.name,
+        "id": roster_player.id,
+        "position": roster_player.position,
+        "points": points,
+    }
+    # Only set rank when sorting on it, so it's left out of the response otherwise
+    if rank is not None:
+        entry["rank"] = rank
+    return entry
+
+
+def get_best_season_lineups(
     league_lineup: LeagueLineupSettings,
-    lineup: List[Player],
-    week: int,
-    sortby: List[str] = ["points"],
-) -> LineupResponse:
-    # Create initial position groups and fill best lineup with them
-    league_lineup_dict = league_lineup.model_dump()
-    sorted_position_groups = _assemble_sorted_position_groups(lineup, sortby)
-    sorted_position_groups.pop(
-        "D/ST", None
-    )  # Undo once we have D/ST and K data everywhere (i.e., DB)
-    sorted_position_groups.pop(
-        "K", None
-    )  # Undo once we have D/ST and K data everywhere (i.e., DB)
-    logger.info(f"Sorted following position groups: {sorted_position_groups.keys()}")
-
-    best_lineup = defaultdict(list)
-    for position in sorted_position_groups.keys():
-        position_count = league_lineup_dict.get(position, 0)
-        for _ in range(position_count):
-            player = sorted_position_groups[position].pop(0)
-            best_lineup[position].append(player)
-
-    # Fill best lineup with players from flex positions
-    flex_positions = _get_flex_positions(league_lineup_dict, sorted_position_groups)
-    logger.info("Flex positions: %s", flex_positions)
-
-    for flex_position_number, flex_position in enumerate(flex_positions, 1):
-        flex_count = league_lineup_dict.get(flex_position, 0)
-        eligible_players = _assemble_sorted_flex_group(
-            flex_position, sorted_position_groups, sortby
+    roster: List[RosterPlayer],
+    points: np.ndarray,
+    weeks: List[int],
+    active: Optional[np.ndarray] = None,
+    rank: Optional[np.ndarray] = None,
+    slots: Optional[List[LineupSlot]] = None,
+) -> Dict[int, LineupDict]:
+    """
+    Best lineup of every week in `weeks`, solving them all at once
+    - Lineups are plain dicts shaped like `LineupResponse`, so no models are built
+      or validated per player week
+
+    :param roster: One entry per row of `points`.
+    :param points: (players, weeks) matrix of fantasy points, columns matching `weeks`.
+    :param active: Optional (players, weeks) mask of who is available each week.
+    :param rank: Optional (players, weeks) priority sorted on ahead of points.
+    :param slots: Optional precompiled `get_lineup_slots` of `league_lineup`.
+    :return: Lineup for each week in `weeks`.
+    """
+    if slots is None:
+        slots = get_lineup_slots(league_lineup.model_dump())
+    positions = np.array([player.position for player in roster], dtype=object)
+    points = np.asarray(points, dtype=np.float64).reshape(len(roster), len(weeks))
+    active = (
+        np.ones(points.shape, dtype=bool)
+        if active is None
+        else np.asarray(active, dtype=bool).copy()
+    )
+    active[np.isin(positions, EXCLUDED_POSITIONS)] = False
+    sort_rank = np.zeros(points.shape) if rank is None else np.asarray(rank, float)
+
+    order = _sorted_player_order(points, sort_rank, active)
+    if _is_greedy_layout(slots):
+        starters_by_slot, slot_orders = _fill_slots_greedy(
+            slots, positions, points, sort_rank, active, order
         )
-        for _ in range(flex_count):
-            player = eligible_players.pop(0)
-            sorted_position_groups[player.position].pop(0)
-            best_lineup[f"FLEX-{flex_position_number}"].append(player)
-    desired_order = ["QB", "RB", "WR", "TE", "FLEX-1", "D/ST", "K"]
-    best_lineup = reorder_dict(best_lineup, desired_order)
-    sorted_position_groups = reorder_dict(sorted_position_groups, desired_order)
-    return LineupResponse(starters=best_lineup, bench=sorted_position_groups)
+    else:
+        starters_by_slot, slot_orders = _fill_slots_exact(
+            slots, positions, active, order
+        )
+    started = np.zeros(points.shape, dtype=bool)
+    for slot_mask in starters_by_slot.values():
+        started |= slot_mask
+
+    # Python lists, so building entries doesn't index numpy scalars one at a time
+    roster_positions = list(dict.fromkeys(positions.tolist()))
+    points_by_week = points.T.tolist()
+    ranks_by_week = (
+        [[None] * len(roster)] * len(weeks)
+        if rank is None
+        else np.asarray(rank).astype(int).T.tolist()
+    )
+    lineups: Dict[int, LineupDict] = {}
+    for week_index, week in enumerate(weeks):
+        week_points = points_by_week[week_index]
+        week_ranks = ranks_by_week[week_index]
+
+        best_lineup = {}
+        for slot_name, slot_mask in starters_by_slot.items():
+            slot_order = slot_orders[slot_name][:, week_index]
+            slot_players = [
+                _player_entry(roster[i], week_points[i], week_ranks[i])
+                for i in slot_order[slot_mask[slot_order, week_index]].tolist()
+            ]
+            if slot_players:
+                best_lineup[slot_name] = slot_players
+
+        week_active = active[:, week_index]
+        bench = {
+            position: []
+            for position in roster_positions
+            if (week_active & (positions == position)).any()
+        }
+        week_order = order[:, week_index]
+        benched = week_active[week_order] & ~started[week_order, week_index]
+        for i in week_order[benched].tolist():
+            bench[roster[i].position].append(
+                _player_entry(roster[i], week_points[i], week_ranks[i])
+            )
+
+        lineups[week] = {
+            "starters": reorder_dict(best_lineup, LINEUP_ORDER),
+            "bench": reorder_dict(bench, LINEUP_ORDER),
+        }
+    return lineups
@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Optional
+
+import cachetools
+import redis.asyncio as redis
+
+from ffwrapped_be.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """
+    Bytes cache shared by the lineup endpoints
+    - TTLs are in seconds, None means the entry only leaves on eviction
+    """
+
+    lock_timeout: float = 30
+    lock_wait_timeout: float = 60
+    lock_poll_interval: float = 0.05
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    async def set(
+        self, key: str, value: bytes, ttl: Optional[float] = None
+    ) -> None: ...
+
+    @abstractmethod
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """
+        Sets the key only if it doesn't exist, returns whether it was set
+        """
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    async def delete_if_equal(self, key: str, value: bytes) -> bool:
+        """
+        Deletes the key only if it still holds `value`, returns whether it did
+        """
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[bytes]],
+        ttl: Optional[float] = None,
+    ) -> bytes:
+        """
+        Returns the cached value, computing and caching it on a miss
+        - Only the holder of `<key>:lock` computes, everyone else waits for its result
+        - The lock expires after `lock_timeout` so a crashed worker can't block the key,
+          and one of the waiters takes it over. Waiters only compute the value
+          themselves after `lock_wait_timeout`
+        - The lock holds a token of its holder, so a holder whose lock expired can't
+          release the lock of the next one
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        lock_key = f"{key}:lock"
+        token = secrets.token_hex().encode()
+        deadline = time.monotonic() + self.lock_wait_timeout
+        locked = await self.add(lock_key, token, self.lock_timeout)
+        while not locked and time.monotonic() < deadline:
+            await asyncio.sleep(self.lock_poll_interval)
+            value = await self.get(key)
+            if value is not None:
+                return value
+            locked = await self.add(lock_key, token, self.lock_timeout)
+
+        try:
+            value = await self.get(key)
+            if value is None:
+                value = await compute()
+                await self.set(key, value, ttl)
+            return value
+        finally:
+            if locked:
+                await self.delete_if_equal(lock_key, token)
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Per-process LRU, bounded to `maxsize` entries
+    """
+
+    def __init__(self, maxsize: int):
+        # Entries are (value, ttl) so each can expire on its own schedule
+        self._cache = cachetools.TLRUCache(maxsize=maxsize, ttu=self._expires_at)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _expires_at(key: str, entry: tuple, now: float) -> float:
+        ttl = entry[1]
+        return now + ttl if ttl is not None else float("inf")
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._cache.get(key)
+        return entry[0] if entry else None
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._cache[key] = (value, ttl)
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        with self._lock:
+            if key in self._cache:
+                return False
+            self._cache[key] = (value, ttl)
+            return True
+
+    async def delete(self, key: str) -> None:
+        with self._lock:
+            self._cache.pop(key, None)
+
+    async def delete_if_equal(self, key: str, value: bytes) -> bool:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or entry[0] != value:
+                return False
+            del self._cache[key]
+            return True
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared by every worker, on any server speaking the Redis protocol
+    - Size is bounded by the server's maxmemory, so configure an LRU/LFU
+      maxmemory-policy (e.g. allkeys-lru) rather than noeviction
+    """
+
+    # GET and DEL in one step, so no other client's value is deleted in between
+    DELETE_IF_EQUAL_SCRIPT = """
+    if redis.call("GET", KEYS[1]) == ARGV[1] then
+        return redis.call("DEL", KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, client: redis.Redis, prefix: str = "ffwrapped:"):
+        self._client = client
+        self._prefix = prefix
+        self._delete_if_equal = client.register_script(self.DELETE_IF_EQUAL_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "ffwrapped:") -> "RedisCacheBackend":
+        return cls(redis.Redis.from_url(url), prefix=prefix)
+
+    @staticmethod
+    def _px(ttl: Optional[float]) -> Optional[int]:
+        return max(int(ttl * 1000), 1) if ttl is not None else None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(self._prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await self._client.set(self._prefix + key, value, px=self._px(ttl))
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        return bool(
+            await self._client.set(self._prefix + key, value, px=self._px(ttl), nx=True)
+        )
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self._prefix + key)
+
+    async def delete_if_equal(self, key: str, value: bytes) -> bool:
+        return bool(
+            await self._delete_if_equal(keys=[self._prefix + key], args=[value])
+        )
+
+    async def clear(self) -> None:
+        keys = [key async for key in self._client.scan_iter(f"{self._prefix}*")]
+        if keys:
+            await self._client.delete(*keys)
+
+
+def create_cache_backend(
+    url: Optional[str] = None, maxsize: int = None
+) -> CacheBackend:
+    """
+    Redis backend when a cache url is configured, per-process LRU otherwise
+    """
+    url = url if url is not None else config.cache_url
+    if url:
+        logger.info("Using Redis cache backend")
+        backend = RedisCacheBackend.from_url(url)
+    else:
+        logger.info("Using in-memory cache backend")
+        backend = InMemoryCacheBackend(maxsize or config.response_cache_size)
+    backend.lock_timeout = config.cache_lock_timeout_seconds
+    backend.lock_wait_timeout = config.cache_lock_wait_seconds
+    return backend
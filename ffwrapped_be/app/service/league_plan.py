@@ -0,0 +1,99 @@
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Tuple
+
+import cachetools
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ffwrapped_be.app.data_models.orm import LeagueSeason
+from ffwrapped_be.app.service import response_cache, scoring
+from ffwrapped_be.app.service.best_lineup import (
+    LeagueLineupSettings,
+    LineupSlot,
+    get_lineup_slots,
+)
+from ffwrapped_be.db import databases as db
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LeaguePlan:
+    """
+    Everything the lineup endpoints need from a league_season row, parsed once
+    - `data_version` is the league_season version the plan was compiled from
+    """
+
+    league_season_id: int
+    platform_league_id: str
+    season: int
+    league_lineup: LeagueLineupSettings
+    scoring_config: Dict[str, float]
+    scoring_weights: np.ndarray
+    scoring_config_hash: str
+    data_version: int
+    lineup_slots: List[LineupSlot] = field(default_factory=list)
+
+
+# Keyed on (platform_league_id, season)
+_plans: cachetools.LRUCache = cachetools.LRUCache(maxsize=256)
+_lock = threading.Lock()
+
+
+def compile_league_plan(league: LeagueSeason) -> LeaguePlan:
+    return LeaguePlan(
+        league_season_id=league.league_season_id,
+        platform_league_id=str(league.platform_league_id),
+        season=league.season,
+        league_lineup=LeagueLineupSettings(**league.lineup_config),
+        scoring_config=dict(league.scoring_config),
+        scoring_weights=scoring.compile_scoring_weights(league.scoring_config),
+        scoring_config_hash=scoring.scoring_config_hash(league.scoring_config),
+        data_version=league.data_version,
+        lineup_slots=get_lineup_slots(league.lineup_config),
+    )
+
+
+def _cached_league_plan(
+    alias: Tuple[str, int], data_version: int
+) -> Optional[LeaguePlan]:
+    with _lock:
+        plan = _plans.get(alias)
+    return plan if plan and plan.data_version >= data_version else None
+
+
+def _cache_league_plan(alias: Tuple[str, int], league: LeagueSeason) -> LeaguePlan:
+    plan = compile_league_plan(league)
+    with _lock:
+        _plans[alias] = plan
+    logger.info(f"Compiled lineup plan for league season {plan.league_season_id}")
+    return plan
+
+
+async def get_league_plan_async(
+    platform_league_id: str | int, season: int, db_session: AsyncSession
+) -> Optional[LeaguePlan]:
+    """
+    Returns the compiled plan for a league, only hitting the db on a cache miss
+    - A plan is recompiled once the league's data version moves past the one it was
+      compiled from, so ETL runs in other processes are picked up without an
+      explicit invalidation
+    """
+    data_version = await response_cache.get_data_version(
+        platform_league_id, season, db_session
+    )
+    if data_version is None:
+        return None
+    alias = (str(platform_league_id), season)
+    plan = _cached_league_plan(alias, data_version)
+    if plan:
+        return plan
+
+    league = await db.get_league_season_by_platform_league_id_async(
+        platform_league_id, season, db_session
+    )
+    if not league:
+        return None
+    return _cache_league_plan(alias, league)
@@ -0,0 +1,126 @@
+import hashlib
+import logging
+import threading
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+import cachetools
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ffwrapped_be.app.service.cache_backend import create_cache_backend
+from ffwrapped_be.app.service.single_flight import SingleFlight
+from ffwrapped_be.config import config
+from ffwrapped_be.db import databases as db
+
+logger = logging.getLogger(__name__)
+
+# league_season.data_version per (platform_league_id, season), re-read from the db
+# at most every `data_version_ttl_seconds` so ETL bumps are picked up quickly
+_data_versions: cachetools.TTLCache = cachetools.TTLCache(
+    maxsize=1024, ttl=config.data_version_ttl_seconds
+)
+# Serialized response bodies, keyed by a key that includes the data version, so
+# entries of an old version are never read again and just age out
+_responses = create_cache_backend()
+# Identical concurrent requests of a worker share one cache lookup / computation
+_flights = SingleFlight()
+# Flights answered from the cache backend vs. ones that ran the computation
+_backend_stats: Dict[str, int] = {"hits": 0, "computed": 0}
+_lock = threading.Lock()
+
+
+async def get_data_version(
+    platform_league_id: str | int, season: int, db_session: AsyncSession
+) -> Optional[int]:
+    """
+    Returns the league's data version, or None if the league doesn't exist
+    """
+    alias = (str(platform_league_id), season)
+    with _lock:
+        data_version = _data_versions.get(alias)
+    if data_version is not None:
+        return data_version
+
+    data_version = await db.get_league_data_version_async(
+        platform_league_id, season, db_session
+    )
+    if data_version is not None:
+        with _lock:
+            _data_versions[alias] = data_version
+    return data_version
+
+
+def _digest(key: Tuple[Hashable, ...]) -> str:
+    return hashlib.sha1(repr(key).encode()).hexdigest()
+
+
+def etag(key: Tuple[Hashable, ...]) -> str:
+    """
+    Strong ETag of a response key, stable across processes and restarts
+    """
+    return f'"{_digest(key)}"'
+
+
+def etag_matches(if_none_match: Optional[str], response_etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag, as per RFC 9110
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.removeprefix("W/") == response_etag:
+            return True
+    return False
+
+
+async def get_or_compute_response(
+    key: Tuple[Hashable, ...], compute: Callable[[], Awaitable[bytes]]
+) -> bytes:
+    """
+    Returns the serialized response for a key
+    - Concurrent requests for it within a worker are coalesced into one
+    - On a miss, one worker computes it while concurrent requests for it wait
+    """
+    cache_key = f"lineups:{_digest(key)}"
+    return await _flights.do(cache_key, lambda: _get_or_compute(cache_key, compute))
+
+
+async def _get_or_compute(
+    cache_key: str, compute: Callable[[], Awaitable[bytes]]
+) -> bytes:
+    computed = False
+
+    async def counted_compute() -> bytes:
+        nonlocal computed
+        computed = True
+        _backend_stats["computed"] += 1
+        return await compute()
+
+    value = await _responses.get_or_compute(
+        cache_key, counted_compute, config.response_cache_ttl_seconds
+    )
+    if not computed:
+        _backend_stats["hits"] += 1
+    return value
+
+
+def get_stats() -> Dict[str, int]:
+    """
+    Lineup requests of this worker
+    - flights: cache lookups, one per distinct concurrent request
+    - coalesced: requests that joined an in-flight lookup instead
+    - hits / computed: flights served by the cache backend vs. computed
+    """
+    return {**_flights.stats(), **_backend_stats}
+
+
+async def clear() -> None:
+    """
+    Drop every cached version and response
+    """
+    with _lock:
+        _data_versions.clear()
+    await _responses.clear()
+    logger.info("Cleared lineup response cache")
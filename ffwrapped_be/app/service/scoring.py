@@ -0,0 +1,173 @@
+import hashlib
+import json
+import logging
+from typing import List, Dict, Optional, Sequence
+
+import numpy as np
+
+from ffwrapped_be.app.data_models.orm import PlayerWeekESPN
+from ffwrapped_be.etl import utils
+
+logger = logging.getLogger(__name__)
+
+# Stat columns of `player_week_espn`, in the order used by every stat matrix
+STAT_COLUMNS: List[str] = list(utils.ESPN_PLAYER_STATS_TO_DB.values())
+_STAT_INDEX: Dict[str, int] = {
+    utils.DB_PLAYER_STATS_TO_ESPN[column]: index
+    for index, column in enumerate(STAT_COLUMNS)
+}
+
+# Threshold stats derived from a single ESPN stat, as (source stat, low, high)
+# with the range being [low, high). Mirrors `utils.generate_derived_espn_statistics`
+DERIVED_STAT_RANGES: Dict[str, tuple] = {
+    # Passing
+    "passing300To399YardGame": ("passingYards", 300, 400),
+    "passing400PlusYardGame": ("passingYards", 400, np.inf),
+    # Rushing
+    "rushing100To199YardGame": ("rushingYards", 100, 200),
+    "rushing200PlusYardGame": ("rushingYards", 200, np.inf),
+    # Receiving
+    "receiving100To199YardGame": ("receivingYards", 100, 200),
+    "receiving200PlusYardGame": ("receivingYards", 200, np.inf),
+    # Defense
+    "defensive0PointsAllowed": ("defensivePointsAllowed", 0, 1),
+    "defensive1To6PointsAllowed": ("defensivePointsAllowed", 1, 7),
+    "defensive7To13PointsAllowed": ("defensivePointsAllowed", 7, 14),
+    "defensive14To17PointsAllowed": ("defensivePointsAllowed", 14, 18),
+    "defensive28To34PointsAllowed": ("defensivePointsAllowed", 28, 35),
+    "defensive35To45PointsAllowed": ("defensivePointsAllowed", 35, 46),
+    "defensive46PlusPointsAllowed": ("defensivePointsAllowed", 46, np.inf),
+    "defensiveLessThan100YardsAllowed": ("defensiveYardsAllowed", -np.inf, 100),
+    "defensive100To199YardsAllowed": ("defensiveYardsAllowed", 100, 200),
+    "defensive200To299YardsAllowed": ("defensiveYardsAllowed", 200, 300),
+    "defensive300To349YardsAllowed": ("defensiveYardsAllowed", 300, 350),
+    "defensive350To399YardsAllowed": ("defensiveYardsAllowed", 350, 400),
+    "defensive400To449YardsAllowed": ("defensiveYardsAllowed", 400, 450),
+    "defensive450To499YardsAllowed": ("defensiveYardsAllowed", 450, 500),
+    "defensive500To549YardsAllowed": ("defensiveYardsAllowed", 500, 550),
+    "defensive550PlusYardsAllowed": ("defensiveYardsAllowed", 550, np.inf),
+}
+
+_FIELD_GOAL_PAIRS = [
+    ("attemptedFieldGoalsFrom60Plus", "madeFieldGoalsFrom60Plus"),
+    ("attemptedFieldGoalsFrom50Plus", "madeFieldGoalsFrom50Plus"),
+    ("attemptedFieldGoalsFrom40To49", "madeFieldGoalsFrom40To49"),
+    ("attemptedFieldGoalsFromUnder40", "madeFieldGoalsFromUnder40"),
+]
+
+# ESPN names of every column in a feature matrix: raw stats, then derived stats
+FEATURE_NAMES: List[str] = (
+    [utils.DB_PLAYER_STATS_TO_ESPN[column] for column in STAT_COLUMNS]
+    + list(DERIVED_STAT_RANGES.keys())
+    + ["missedFieldGoals"]
+)
+
+SCORING_CATEGORIES = ["passing", "rushing", "receiving", "kicking", "defense", "misc"]
+_KICKING_PREFIXES = ("made", "attempted", "missed")
+_DEFENSE_PREFIXES = ("defensive", "kickoff", "punt", "interception", "fumbleReturn")
+
+
+def _feature_category(feature_name: str) -> str:
+    for category in ["passing", "rushing", "receiving"]:
+        if feature_name.startswith(category):
+            return category
+    if feature_name.startswith(_KICKING_PREFIXES):
+        return "kicking"
+    if feature_name.startswith(_DEFENSE_PREFIXES):
+        return "defense"
+    return "misc"
+
+
+# One-hot (len(FEATURE_NAMES), len(SCORING_CATEGORIES)) matrix of feature categories
+_CATEGORY_MATRIX = np.array(
+    [
+        [_feature_category(name) == category for category in SCORING_CATEGORIES]
+        for name in FEATURE_NAMES
+    ],
+    dtype=np.float64,
+)
+
+
+def scoring_config_hash(scoring_config: Dict[str, float]) -> str:
+    """
+    Stable fingerprint of a scoring config, used to detect stale materialized points
+    """
+    payload = json.dumps(scoring_config, sort_keys=True).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def compile_scoring_weights(scoring_config: Dict[str, float]) -> np.ndarray:
+    """
+    Compile a league's scoring config into a weight vector aligned with FEATURE_NAMES
+    """
+    weights = np.zeros(len(FEATURE_NAMES), dtype=np.float64)
+    for index, feature_name in enumerate(FEATURE_NAMES):
+        scoring_key = utils.ESPN_PLAYER_STATS_TO_SCORING_CONFIG.get(
+            feature_name, feature_name
+        )
+        if scoring_key in scoring_config:
+            weights[index] = scoring_config[scoring_key]
+    return weights
+
+
+def with_derived_stats(stats: np.ndarray) -> np.ndarray:
+    """
+    Takes a (..., len(STAT_COLUMNS)) matrix of raw stats
+    Returns a (..., len(FEATURE_NAMES)) matrix with derived threshold stats appended
+
+    Like `generate_derived_espn_statistics`, a stat is only derived when its
+    source stat is non-zero
+    """
+    derived = []
+    for source, low, high in DERIVED_STAT_RANGES.values():
+        values = stats[..., _STAT_INDEX[source]]
+        derived.append((values != 0) & (values >= low) & (values < high))
+
+    attempted = sum(stats[..., _STAT_INDEX[att]] for att, _ in _FIELD_GOAL_PAIRS)
+    made = sum(stats[..., _STAT_INDEX[made]] for _, made in _FIELD_GOAL_PAIRS)
+    missed = np.where(attempted != 0, attempted - made, 0)
+
+    return np.concatenate(
+        [stats, np.stack(derived, axis=-1).astype(stats.dtype), missed[..., None]],
+        axis=-1,
+    )
+
+
+def player_week_stats(player_week: Optional[PlayerWeekESPN]) -> List[Optional[int]]:
+    if player_week is None:
+        return [0] * len(STAT_COLUMNS)
+    return [getattr(player_week, column) for column in STAT_COLUMNS]
+
+
+def build_season_stat_matrix(
+    weeks_by_player: Sequence[Dict[int, PlayerWeekESPN]], weeks: Sequence[int]
+) -> np.ndarray:
+    """
+    Takes one {week: PlayerWeekESPN} dict per player
+    Returns a (players, weeks, len(STAT_COLUMNS)) matrix, with zeros for missing data
+    """
+    stats = np.array(
+        [
+            [player_week_stats(player_weeks.get(week)) for week in weeks]
+            for player_weeks in weeks_by_player
+        ],
+        dtype=np.float64,
+    ).reshape(len(weeks_by_player), len(weeks), len(STAT_COLUMNS))
+    return np.nan_to_num(stats, copy=False)
+
+
+def score_stat_matrix(stats: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Score a (..., len(STAT_COLUMNS)) matrix of raw stats in a single matmul
+    Returns fantasy points rounded to 2 decimals, with shape (...)
+    """
+    return np.round(with_derived_stats(stats) @ weights, 2)
+
+
+def score_stat_matrix_by_category(stats: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Score a (..., len(STAT_COLUMNS)) matrix of raw stats per scoring category
+    Returns points with shape (..., len(SCORING_CATEGORIES)), rounded to 2 decimals
+    """
+    category_weights = weights[:, None] * _CATEGORY_MATRIX
+    return np.round(with_derived_stats(stats) @ category_weights, 2)
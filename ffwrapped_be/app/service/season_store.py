@@ -0,0 +1,269 @@
+import asyncio
+import glob
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ffwrapped_be.app.service import scoring
+from ffwrapped_be.config import config
+from ffwrapped_be.db import databases as db
+
+logger = logging.getLogger(__name__)
+
+# Week axis of the stat matrix, index 0 is unused so weeks index directly
+MAX_WEEK = 18
+
+
+@dataclass
+class SeasonStore:
+    """
+    Every player week of a season held as one (player_seasons, weeks, stats) matrix
+    - Stats follow `scoring.STAT_COLUMNS`, and are 0 for missing player weeks
+    """
+
+    season: int
+    data_version: int
+    player_season_rows: Dict[int, int]
+    stats: np.ndarray
+    loaded_at: float = field(default_factory=time.monotonic)
+    checked_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def nbytes(self) -> int:
+        return self.stats.nbytes
+
+    @property
+    def mapped(self) -> bool:
+        """
+        Whether stats are memory-mapped from a snapshot, sharing pages across workers
+        """
+        return isinstance(self.stats, np.memmap)
+
+    def week_stats(
+        self, player_season_ids: Sequence[int], weeks: Sequence[int]
+    ) -> np.ndarray:
+        """
+        Returns a (len(player_season_ids), len(STAT_COLUMNS)) matrix of raw stats,
+        one row per (player_season_id, week) pair
+        """
+        rows = [self.player_season_rows.get(id, -1) for id in player_season_ids]
+        stats = self.stats[rows, list(weeks)].astype(np.float64)
+        missing = np.array(rows) < 0
+        if missing.any():
+            logger.warning(
+                f"{missing.sum()} player weeks aren't in the season {self.season} "
+                "store, scoring them as 0"
+            )
+            stats[missing] = 0
+        return stats
+
+
+_stores: Dict[int, SeasonStore] = {}
+_load_lock = asyncio.Lock()
+
+
+def build_season_store(season: int, data_version: int, rows: List) -> SeasonStore:
+    """
+    Takes (player_season_id, week, *stat columns) rows, see
+    `db.get_season_player_week_stats_async`
+    """
+    player_season_rows: Dict[int, int] = {}
+    for row in rows:
+        player_season_rows.setdefault(row[0], len(player_season_rows))
+
+    stats = np.zeros(
+        (len(player_season_rows), MAX_WEEK + 1, len(scoring.STAT_COLUMNS)),
+        dtype=np.float32,
+    )
+    if rows:
+        values = np.array([row[2:] for row in rows], dtype=np.float32)
+        stats[
+            [player_season_rows[row[0]] for row in rows], [row[1] for row in rows]
+        ] = np.nan_to_num(values, copy=False)
+    return SeasonStore(season, data_version, player_season_rows, stats)
+
+
+def _snapshot_index_path(season: int, directory: str) -> str:
+    return os.path.join(directory, f"player_week_stats_{season}.json")
+
+
+def write_season_snapshot(
+    season: int, db_session: Session, directory: str = None
+) -> str:
+    """
+    Writes a season's stat matrix as `.npy`, with a JSON sidecar indexing its rows
+    - The matrix file name carries the data version, and the sidecar is replaced
+      last, so readers never pair an index with another version's matrix
+    Returns the sidecar's path
+    """
+    directory = directory or config.season_snapshot_dir
+    data_version = db.get_season_data_version(season, db_session)
+    rows = db.get_season_player_week_stats(season, db_session)
+    store = build_season_store(season, data_version, rows)
+
+    os.makedirs(directory, exist_ok=True)
+    matrix_name = f"player_week_stats_{season}_v{data_version}.npy"
+    with open(os.path.join(directory, matrix_name + ".tmp"), "wb") as f:
+        np.save(f, store.stats)
+    os.replace(
+        os.path.join(directory, matrix_name + ".tmp"),
+        os.path.join(directory, matrix_name),
+    )
+
+    index_path = _snapshot_index_path(season, directory)
+    index = {
+        "season": season,
+        "data_version": data_version,
+        "matrix": matrix_name,
+        "stat_columns": scoring.STAT_COLUMNS,
+        "player_season_ids": list(store.player_season_rows),
+    }
+    with open(index_path + ".tmp", "w") as f:
+        json.dump(index, f)
+    os.replace(index_path + ".tmp", index_path)
+
+    # Workers still mapping an old matrix keep it readable until they remap
+    for path in glob.glob(
+        os.path.join(directory, f"player_week_stats_{season}_v*.npy")
+    ):
+        if os.path.basename(path) != matrix_name:
+            os.remove(path)
+    logger.info(
+        f"Wrote season {season} snapshot: {len(rows)} player weeks, "
+        f"{store.nbytes / 1024**2:.1f}MB, data version {data_version}"
+    )
+    return index_path
+
+
+def read_season_snapshot(season: int, directory: str = None) -> Optional[SeasonStore]:
+    """
+    Memory-maps a season snapshot read-only, or returns None if there's none usable
+    """
+    directory = directory or config.season_snapshot_dir
+    index_path = _snapshot_index_path(season, directory)
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path) as f:
+        index = json.load(f)
+    if index["stat_columns"] != scoring.STAT_COLUMNS:
+        logger.warning(f"Season {season} snapshot has other stat columns, ignoring it")
+        return None
+
+    try:
+        stats = np.load(os.path.join(directory, index["matrix"]), mmap_mode="r")
+    except FileNotFoundError:
+        # Replaced by a newer snapshot since the index was read
+        return None
+    player_season_rows = {
+        player_season_id: row
+        for row, player_season_id in enumerate(index["player_season_ids"])
+    }
+    return SeasonStore(season, index["data_version"], player_season_rows, stats)
+
+
+async def load_season_store(season: int, db_session: AsyncSession) -> SeasonStore:
+    """
+    (Re)loads a season into memory, unless it would exceed the memory budget
+    - Maps the season's snapshot when it's current, else reads the db
+    """
+    start = time.perf_counter()
+    data_version = await db.get_season_data_version_async(season, db_session)
+    store = read_season_snapshot(season) if config.season_snapshot_dir else None
+    if store is None or store.data_version != data_version:
+        rows = await db.get_season_player_week_stats_async(season, db_session)
+        store = build_season_store(season, data_version, rows)
+
+    other_bytes = sum(s.nbytes for s in _stores.values() if s.season != season)
+    budget_bytes = config.season_store_memory_budget_mb * 1024**2
+    if other_bytes + store.nbytes > budget_bytes:
+        logger.warning(
+            f"Season {season} store needs {store.nbytes / 1024**2:.1f}MB, over the "
+            f"{config.season_store_memory_budget_mb}MB budget, reading it from the db"
+        )
+        _stores.pop(season, None)
+        return store
+
+    _stores[season] = store
+    logger.info(
+        f"Loaded season {season} store from {'snapshot' if store.mapped else 'db'}: "
+        f"{store.nbytes / 1024**2:.1f}MB in {time.perf_counter() - start:.2f}s"
+    )
+    return store
+
+
+async def load_season_stores() -> None:
+    """
+    Loads every season in `config.season_store_seasons`, at app startup
+    """
+    async with db.AsyncSessionLocal() as db_session:
+        for season in config.season_store_seasons:
+            await load_season_store(season, db_session)
+
+
+async def get_season_store(
+    season: int, db_session: AsyncSession
+) -> Optional[SeasonStore]:
+    """
+    Returns the season's store, or None if the season isn't held in memory
+    - Checks the season's data version at most every `data_version_ttl_seconds`,
+      and reloads the store once the ETL changed its player weeks
+    """
+    store = _stores.get(season)
+    if store is None:
+        return None
+    if time.monotonic() - store.checked_at < config.data_version_ttl_seconds:
+        return store
+
+    async with _load_lock:
+        store = _stores.get(season)
+        if store is None or (
+            time.monotonic() - store.checked_at < config.data_version_ttl_seconds
+        ):
+            return store
+        data_version = await db.get_season_data_version_async(season, db_session)
+        if data_version != store.data_version:
+            logger.info(f"Season {season} data changed, reloading its store")
+            await load_season_store(season, db_session)
+        else:
+            store.checked_at = time.monotonic()
+        return _stores.get(season)
+
+
+def get_memory_report() -> Dict:
+    """
+    Memory held by the season stores of this worker process
+    """
+    return {
+        "budget_mb": config.season_store_memory_budget_mb,
+        "used_mb": sum(store.nbytes for store in _stores.values()) / 1024**2,
+        "seasons": {
+            season: {
+                "player_seasons": len(store.player_season_rows),
+                "shape": list(store.stats.shape),
+                "mb": store.nbytes / 1024**2,
+                "mapped": store.mapped,
+                "data_version": store.data_version,
+                "age_seconds": round(time.monotonic() - store.loaded_at),
+            }
+            for season, store in _stores.items()
+        },
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    db_session = db.EtlSessionLocal()
+    try:
+        for season in sys.argv[1:]:
+            write_season_snapshot(int(season), db_session)
+    finally:
+        db_session.close()
@@ -0,0 +1,37 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one in-flight computation
+    - Calls arriving while it runs await the same result (or exception)
+    - Covers a single event loop, i.e. one uvicorn worker
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+        self.flights = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+        else:
+            self.flights += 1
+            flight = asyncio.ensure_future(compute())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        # A cancelled (e.g. disconnected) caller mustn't cancel everyone's computation
+        return await asyncio.shield(flight)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "flights": self.flights,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+        }
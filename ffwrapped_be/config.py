@@ -1,5 +1,6 @@
 # filepath: /Users/kniu91/Documents/projects/ffwrapped_be/ffwrapped_be/config.py
 import os
+import re
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -16,10 +17,64 @@ class Config:
     espn_swid = os.getenv("ESPN_SWID")
     espn_s2 = os.getenv("ESPN_S2")
     espn_league_id = os.getenv("ESPN_LEAGUE_ID")
+    # ESPN fantasy API root, e.g. a local stub server's, espn_api's default when unset
+    espn_base_url = os.getenv("ESPN_BASE_URL")
+    # Player card fetching of the ETL: concurrent requests, ids per request, rate cap
+    espn_fetch_workers = int(os.getenv("ESPN_FETCH_WORKERS", 8))
+    espn_player_batch_size = int(os.getenv("ESPN_PLAYER_BATCH_SIZE", 50))
+    espn_requests_per_second = float(os.getenv("ESPN_REQUESTS_PER_SECOND", 10))
+    # On-disk cache of extractor HTTP GETs, see etl/extractors/http_cache.py
+    http_cache_dir = os.getenv("HTTP_CACHE_DIR")
+    http_cache_ttl_seconds = float(os.getenv("HTTP_CACHE_TTL_SECONDS", 86400))
+    # "record", or "replay" to serve recorded responses only, offline
+    http_cache_mode = os.getenv("HTTP_CACHE_MODE", "record")
 
     railway_db_url = os.getenv("RAILWAY_DB_URL")
     railway_db_user = os.getenv("RAILWAY_DB_USER")
     railway_db_password = os.getenv("RAILWAY_DB_PASSWORD")
+    # Same database through asyncpg, for the async API read path
+    railway_async_db_url = os.getenv("RAILWAY_ASYNC_DB_URL") or (
+        re.sub(r"^postgres(ql)?://", "postgresql+asyncpg://", railway_db_url)
+        if railway_db_url
+        else None
+    )
+
+    # Connection pools of the API engines
+    db_pool_size = int(os.getenv("DB_POOL_SIZE", 5))
+    db_max_overflow = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    db_pool_timeout = int(os.getenv("DB_POOL_TIMEOUT", 30))
+    db_pool_recycle = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    db_pool_pre_ping = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    db_statement_timeout_ms = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000))
+
+    # Connection pool of the ETL engine, for long running loads (0 = no timeout)
+    etl_db_pool_size = int(os.getenv("ETL_DB_POOL_SIZE", 2))
+    etl_db_max_overflow = int(os.getenv("ETL_DB_MAX_OVERFLOW", 2))
+    etl_db_statement_timeout_ms = int(os.getenv("ETL_DB_STATEMENT_TIMEOUT_MS", 0))
+    # Loaded weeks the incremental player week ETL reloads, for ESPN stat corrections
+    etl_stat_correction_weeks = int(os.getenv("ETL_STAT_CORRECTION_WEEKS", 1))
+
+    # Lineup response cache, see app/service/response_cache.py
+    response_cache_size = int(os.getenv("RESPONSE_CACHE_SIZE", 512))
+    data_version_ttl_seconds = float(os.getenv("DATA_VERSION_TTL_SECONDS", 5))
+    # Redis url shared by all workers, the cache is per-process when unset
+    cache_url = os.getenv("CACHE_URL")
+    response_cache_ttl_seconds = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 86400))
+    cache_lock_timeout_seconds = float(os.getenv("CACHE_LOCK_TIMEOUT_SECONDS", 30))
+    # How long requests wait on another worker's computation before running their
+    # own, past the lock timeout so an expired lock is taken over by one of them
+    cache_lock_wait_seconds = float(
+        os.getenv("CACHE_LOCK_WAIT_SECONDS", 2 * cache_lock_timeout_seconds)
+    )
+    # Seasons whose player weeks the API holds in memory, e.g. "2023,2024"
+    season_store_seasons = [
+        int(season)
+        for season in os.getenv("SEASON_STORE_SEASONS", "").split(",")
+        if season.strip()
+    ]
+    season_store_memory_budget_mb = int(os.getenv("SEASON_STORE_MEMORY_BUDGET_MB", 256))
+    # Directory of ETL-written season snapshots that workers memory-map, if any
+    season_snapshot_dir = os.getenv("SEASON_SNAPSHOT_DIR")
 
     rapid_api_tank_url = os.getenv("RAPID_API_TANK_URL")
     rapid_api_host = os.getenv("RAPID_API_HOST")
@@ -0,0 +1,176 @@
+"""
+Ad-hoc benchmarks of db read and load paths, run against the configured database
+
+    poetry run python -m ffwrapped_be.db.benchmarks <platform_league_id> <platform_team_id>
+    poetry run python -m ffwrapped_be.db.benchmarks bulk-load [rows]
+"""
+
+import logging
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy import event
+
+from ffwrapped_be.app.data_models import orm
+from ffwrapped_be.app.service import scoring
+from ffwrapped_be.db import databases as db
+
+logger = logging.getLogger(__name__)
+
+
+def benchmark_read(
+    name: str, read: Callable, repeat: int = 5, engine=db.engine
+) -> Dict[str, float]:
+    """
+    Runs `read(db_session)` `repeat` times, each in a fresh session
+    - Counts statements and rows the database returned, before any ORM uniquing
+    """
+    counts = {"statements": 0, "rows": 0}
+
+    def count_rows(conn, cursor, statement, parameters, context, executemany):
+        counts["statements"] += 1
+        counts["rows"] += max(cursor.rowcount, 0)
+
+    timings = []
+    event.listen(engine, "after_cursor_execute", count_rows)
+    try:
+        for _ in range(repeat):
+            db_session = db.SessionLocal()
+            try:
+                start = time.perf_counter()
+                results = read(db_session)
+                timings.append(time.perf_counter() - start)
+            finally:
+                db_session.close()
+    finally:
+        event.remove(engine, "after_cursor_execute", count_rows)
+
+    result = {
+        "statements": counts["statements"] / repeat,
+        "rows": counts["rows"] / repeat,
+        "results": len(results),
+        "best_ms": min(timings) * 1000,
+        "median_ms": statistics.median(timings) * 1000,
+    }
+    logger.info(
+        f"{name}: {result['statements']:.0f} statements, {result['rows']:.0f} db rows, "
+        f"{result['results']} results, best {result['best_ms']:.1f}ms, "
+        f"median {result['median_ms']:.1f}ms"
+    )
+    return result
+
+
+def benchmark_lineup_reads(
+    platform_league_id: str, platform_team_id: str, season: int = 2024
+) -> None:
+    """
+    Compares the ORM read path with the lean column-projection path for one team
+    """
+
+    def orm_read(db_session):
+        players = db.get_weekly_team_players(
+            platform_league_id, platform_team_id, season, db_session
+        ) + db.get_draft_team_players(
+            platform_league_id, platform_team_id, season, db_session
+        )
+        # Touch what the lineup endpoints used from each player
+        for player in players:
+            player.seasons[0].espn_weeks_dict
+        return players
+
+    def lean_read(db_session):
+        return db.get_weekly_lineup_rows(
+            platform_league_id, season, db_session, platform_team_id=platform_team_id
+        ) + db.get_draft_lineup_rows(
+            platform_league_id, season, db_session, platform_team_id=platform_team_id
+        )
+
+    orm = benchmark_read("ORM read path", orm_read)
+    lean = benchmark_read("Lean read path", lean_read)
+    logger.info(
+        f"Lean path returns {orm['rows'] / max(lean['rows'], 1):.1f}x fewer db rows "
+        f"and is {orm['median_ms'] / max(lean['median_ms'], 1e-9):.1f}x faster"
+    )
+
+
+def _player_week_records(rows: int) -> List[Dict]:
+    """
+    Made-up player weeks with every stat set, as `transform_load_player_week` loads
+    - No player season, so they never conflict with existing player weeks
+    """
+    return [
+        {
+            "player_season_id": None,
+            "week": i % 18 + 1,
+            **{column: (i + j) % 50 for j, column in enumerate(scoring.STAT_COLUMNS)},
+        }
+        for i in range(rows)
+    ]
+
+
+def benchmark_load(name: str, load: Callable, rows: int, repeat: int = 3) -> float:
+    """
+    Runs `load(records, db_session)` `repeat` times, rolling each load back
+    Returns the median rows/sec
+    """
+    timings = []
+    for _ in range(repeat):
+        records = _player_week_records(rows)
+        db_session = db.SessionLocal()
+        try:
+            start = time.perf_counter()
+            load(records, db_session)
+            timings.append(time.perf_counter() - start)
+        finally:
+            db_session.rollback()
+            db_session.close()
+
+    rows_per_second = rows / statistics.median(timings)
+    logger.info(
+        f"{name}: {rows} rows, best {min(timings) * 1000:.0f}ms, "
+        f"median {statistics.median(timings) * 1000:.0f}ms, "
+        f"{rows_per_second:,.0f} rows/sec"
+    )
+    return rows_per_second
+
+
+def benchmark_bulk_loads(rows: int = 20000) -> None:
+    """
+    Compares `bulk_insert` with `bulk_copy_insert` loading player weeks
+    """
+    orm_load = benchmark_load(
+        "bulk_insert",
+        lambda records, db_session: db.bulk_insert(
+            records, orm.PlayerWeekESPN, flush=True, db=db_session
+        ),
+        rows,
+    )
+    copy_load = benchmark_load(
+        "bulk_copy_insert",
+        lambda records, db_session: db.bulk_copy_insert(
+            records, orm.PlayerWeekESPN, flush=True, db=db_session
+        ),
+        rows,
+    )
+    benchmark_load(
+        "bulk_copy_insert returning keys",
+        lambda records, db_session: db.bulk_copy_insert(
+            records,
+            orm.PlayerWeekESPN,
+            returning=["player_week_id"],
+            flush=True,
+            db=db_session,
+        ),
+        rows,
+    )
+    logger.info(f"COPY loads {copy_load / orm_load:.1f}x the rows/sec of bulk_insert")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if sys.argv[1] == "bulk-load":
+        benchmark_bulk_loads(*(int(arg) for arg in sys.argv[2:3]))
+    else:
+        benchmark_lineup_reads(sys.argv[1], sys.argv[2])
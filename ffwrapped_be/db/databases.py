@@ -1,19 +1,147 @@
-from typing import List, Dict, Any
-from sqlalchemy import create_engine, insert, text
+from typing import IO, Iterator, List, Dict, Any, Tuple
+import io
+import json
+import threading
+import time
+from sqlalchemy import (
+    Integer,
+    Row,
+    Select,
+    create_engine,
+    exc,
+    func,
+    insert,
+    or_,
+    select,
+    text,
+    true,
+    update,
+)
 from sqlalchemy.dialects.postgresql import insert as pg_insert
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import contains_eager, sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.types import TypeEngine
 import logging
 
 from ffwrapped_be.config import config
 from ffwrapped_be.app.data_models import orm
+from ffwrapped_be.etl import utils
 
 logger = logging.getLogger(__name__)
 
-# Create engine
-engine = create_engine(config.railway_db_url)
 
-# Create sessionmaker
+class _PoolWaitMixin:
+    """
+    Records how long checkouts wait for a connection, on top of the pool's own counts
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.checkout_timeouts += timed_out
+                self.checkout_wait_total += wait
+                self.checkout_wait_max = max(self.checkout_wait_max, wait)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "size": self.size(),
+                "checked_in": self.checkedin(),
+                "checked_out": self.checkedout(),
+                "overflow": max(self.overflow(), 0),
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_total_ms": round(self.checkout_wait_total * 1000, 3),
+                "checkout_wait_max_ms": round(self.checkout_wait_max * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(_PoolWaitMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_PoolWaitMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _pool_options(pool_size: int, max_overflow: int) -> Dict[str, Any]:
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": config.db_pool_timeout,
+        "pool_recycle": config.db_pool_recycle,
+        "pool_pre_ping": config.db_pool_pre_ping,
+    }
+
+
+# Create engines, with separate pools so ETL loads can't starve API requests
+engine = create_engine(
+    config.railway_db_url,
+    poolclass=InstrumentedQueuePool,
+    connect_args={"options": f"-c statement_timeout={config.db_statement_timeout_ms}"},
+    **_pool_options(config.db_pool_size, config.db_max_overflow),
+)
+etl_engine = create_engine(
+    config.railway_db_url,
+    poolclass=InstrumentedQueuePool,
+    connect_args={
+        "options": f"-c statement_timeout={config.etl_db_statement_timeout_ms}"
+    },
+    **_pool_options(config.etl_db_pool_size, config.etl_db_max_overflow),
+)
+
+# Create sessionmakers
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+EtlSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=etl_engine)
+
+# Async engine and sessionmaker for the API read path
+async_engine = create_async_engine(
+    config.railway_async_db_url,
+    poolclass=InstrumentedAsyncQueuePool,
+    connect_args={
+        "server_settings": {"statement_timeout": str(config.db_statement_timeout_ms)}
+    },
+    **_pool_options(config.db_pool_size, config.db_max_overflow),
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Connection and checkout wait stats of every engine's pool, in this process
+    """
+    return {
+        "api": engine.pool.stats(),
+        "api_async": async_engine.pool.stats(),
+        "etl": etl_engine.pool.stats(),
+    }
+
+
+# Stat columns selected by the lean lineup read path
+PLAYER_WEEK_STAT_COLUMNS = [
+    getattr(orm.PlayerWeekESPN, column)
+    for column in utils.ESPN_PLAYER_STATS_TO_DB.values()
+]
 
 
 # Dependency to get a new session
@@ -25,6 +153,12 @@ def get_db():
         db.close()
 
 
+# Dependency to get a new async session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def commit(db):
     try:
         db.commit()
@@ -76,7 +210,12 @@ def bulk_insert(
         db = SessionLocal()
         new_session = True
     try:
-        records = db.scalars(insert(record_type).returning(record_type), records).all()
+        # unique() is required for record types that eagerly join a collection
+        records = (
+            db.scalars(insert(record_type).returning(record_type), records)
+            .unique()
+            .all()
+        )
         if flush:
             db.flush()
             # TODO: this logic lowkey makes no sense- need to fix
@@ -92,6 +231,236 @@ def bulk_insert(
     return records
 
 
+def _csv_field(value: Any, column_type: TypeEngine = None) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and isinstance(column_type, Integer):
+        # COPY parses integer columns strictly, so "6.0" is rejected where a bound
+        # float would have been cast. round() matches that cast's half-to-even
+        value = round(value)
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    # Always quoted, so an empty string isn't read back as NULL
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_insert(
+    csv_file: IO,
+    record_type: orm.Base,
+    columns: List[str],
+    returning: List[str],
+    db: Session,
+    update_on: List[str] = None,
+    skip_on: List[str] = None,
+) -> Tuple[int, List[tuple]]:
+    table = record_type.__table__.name
+    staging = f"staging_{table}"
+    column_list = ", ".join(columns)
+    updated = [column for column in columns if column not in (update_on or [])]
+    if update_on and updated:
+        # Rows whose values haven't changed aren't rewritten, nor returned
+        current = ", ".join(f"{table}.{column}" for column in updated)
+        excluded = ", ".join(f"EXCLUDED.{column}" for column in updated)
+        on_conflict = (
+            f"ON CONFLICT ({', '.join(update_on)}) DO UPDATE SET "
+            + ", ".join(f"{column} = EXCLUDED.{column}" for column in updated)
+            + f" WHERE ({current}) IS DISTINCT FROM ({excluded})"
+        )
+    elif skip_on:
+        on_conflict = f"ON CONFLICT ({', '.join(skip_on)}) DO NOTHING"
+    else:
+        on_conflict = "ON CONFLICT DO NOTHING"
+    cursor = db.connection().connection.cursor()
+    cursor.execute(
+        f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) "
+        "ON COMMIT DROP"
+    )
+    cursor.copy_expert(
+        f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv)", csv_file
+    )
+    if skip_on:
+        cursor.execute(
+            f"SELECT count(*), count({table}.{skip_on[0]}) FROM {staging} "
+            f"LEFT JOIN {table} USING ({', '.join(skip_on)})"
+        )
+        staged, present = cursor.fetchone()
+    cursor.execute(
+        f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging} "
+        + on_conflict
+        + (f" RETURNING {', '.join(returning)}" if returning else "")
+    )
+    rows = cursor.fetchall() if returning else []
+    inserted = cursor.rowcount
+    if skip_on and inserted != staged - present:
+        logger.error(
+            f"Copied {inserted} of {staged} records into {table}, but only {present} "
+            f"had a {', '.join(skip_on)} already present"
+        )
+        raise Exception(f"Rows copied into {table} were silently skipped")
+    cursor.execute(f"DROP TABLE {staging}")
+    logger.info(f"Copied {inserted} records into {table}")
+    return inserted, rows
+
+
+def copy_insert_csv(
+    csv_file: IO,
+    record_type: orm.Base,
+    columns: List[str],
+    flush: bool = False,
+    db=None,
+) -> int:
+    """
+    Loads headerless CSV rows through COPY into a staging table, then
+    INSERT ... SELECT ... ON CONFLICT (<primary key>) DO NOTHING into the record
+    type's table
+    - Rows skip parameter binding and the ORM, so large loads run far faster than
+      `bulk_insert`
+    - Unquoted empty fields are NULL, quoted ones empty strings (CSV COPY rules)
+    - Only rows whose primary key is already present are skipped. Other unique
+      violations raise, as does any row skipped otherwise, e.g. a key repeated
+      within the rows
+    Returns the number of rows inserted
+    """
+    primary_key = [column.name for column in record_type.__table__.primary_key]
+    try:
+        inserted, _ = _copy_insert(
+            csv_file, record_type, columns, None, db, skip_on=primary_key
+        )
+        if not flush:
+            db.commit()
+    except:
+        db.rollback()
+        raise
+    return inserted
+
+
+def bulk_copy_insert(
+    records: List[Dict],
+    record_type: orm.Base,
+    returning: List[str] = None,
+    update_on: List[str] = None,
+    flush: bool = False,
+    db=None,
+) -> List[tuple]:
+    """
+    `bulk_insert` for large loads, through COPY, see `copy_insert_csv`
+    - Records are dicts, and columns missing from a record are NULL
+    - Records conflicting with an existing row are skipped instead of raising, or
+      update the row's other columns when conflicting on the `update_on` columns
+      and any of them changed
+    Returns the `returning` columns of each inserted or changed row, or [] without
+    `returning`
+    """
+    if not records:
+        logger.info("No records to insert for bulk copy insert function")
+        return []
+    columns = list(dict.fromkeys(key for record in records for key in record))
+    column_types = [record_type.__table__.columns[column].type for column in columns]
+    csv_file = io.StringIO()
+    csv_file.writelines(
+        ",".join(
+            _csv_field(record.get(column), column_type)
+            for column, column_type in zip(columns, column_types)
+        )
+        + "\n"
+        for record in records
+    )
+    csv_file.seek(0)
+
+    new_session = False
+    if db is None:
+        db = SessionLocal()
+        new_session = True
+    try:
+        _, rows = _copy_insert(
+            csv_file, record_type, columns, returning, db, update_on=update_on
+        )
+        if not flush:
+            db.commit()
+    except:
+        db.rollback()
+        raise
+    finally:
+        if new_session:
+            db.close()
+    return rows
+
+
+def bulk_upsert_player_weeks(records: List[Dict], db: Session) -> List[int]:
+    """
+    Inserts player weeks, or updates their stats where they changed
+    Returns the player_week_ids inserted or changed
+    """
+    rows = bulk_copy_insert(
+        records,
+        orm.PlayerWeekESPN,
+        returning=["player_week_id"],
+        update_on=["player_season_id", "week"],
+        db=db,
+    )
+    return [player_week_id for (player_week_id,) in rows]
+
+
+def bulk_upsert_league_weekly_teams(
+    records: List[Dict], db: Session
+) -> List[Tuple[int, int]]:
+    """
+    Inserts weekly lineup entries, or updates their lineup position where it changed
+    Returns the (league_team_id, player_week_id) keys inserted or changed
+    """
+    return [
+        tuple(row)
+        for row in bulk_copy_insert(
+            records,
+            orm.LeagueWeeklyTeam,
+            returning=["league_team_id", "player_week_id"],
+            update_on=["league_team_id", "player_week_id"],
+            db=db,
+        )
+    ]
+
+
+def bulk_upsert_draft_teams(records: List[Dict], db: Session) -> List[Tuple[int, int]]:
+    """
+    Inserts draft picks, or updates their pick number where it changed
+    Returns the (league_team_id, player_id) keys inserted or changed
+    """
+    return [
+        tuple(row)
+        for row in bulk_copy_insert(
+            records,
+            orm.DraftTeam,
+            returning=["league_team_id", "player_id"],
+            update_on=["league_team_id", "player_id"],
+            db=db,
+        )
+    ]
+
+
+def reset_id_sequence(record_type: orm.Base, db: Session) -> None:
+    """
+    Moves the serial primary key's sequence past the table's max id, e.g. after
+    loading rows with their ids
+    """
+    table = record_type.__table__
+    id_column = table.primary_key.columns.values()[0].name
+    try:
+        db.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', '{id_column}'), "
+                f"COALESCE((SELECT MAX({id_column}) FROM {table.name}), 0) + 1, false)"
+            )
+        )
+        db.commit()
+    except:
+        db.rollback()
+        raise
+
+
 def insert_record(record: orm.Base, flush: bool = False, db=None) -> orm.Base:
     new_session = False
     if db is None:
@@ -196,6 +565,40 @@ def get_players_by_espn_id(espn_ids: List[int], db: Session = None) -> List[orm.
     return players
 
 
+def get_player_season_ids_by_espn_id(
+    espn_ids: List[str], season: int, db: Session
+) -> Dict[int, int]:
+    """
+    Maps ESPN player ids to their player_season_id in the season, for the ids
+    with a player season
+    """
+    rows = db.execute(
+        select(orm.Player.espn_id, orm.PlayerSeason.player_season_id)
+        .join(orm.PlayerSeason, orm.PlayerSeason.player_id == orm.Player.player_id)
+        .where(orm.Player.espn_id.in_(espn_ids), orm.PlayerSeason.season == season)
+    ).all()
+    return {int(espn_id): player_season_id for espn_id, player_season_id in rows}
+
+
+def get_player_week_ids(season: int, db: Session) -> Dict[Tuple[int, int], int]:
+    """
+    Maps (player_season_id, week) to player_week_id for every player week of a season
+    """
+    rows = db.execute(
+        select(
+            orm.PlayerWeekESPN.player_season_id,
+            orm.PlayerWeekESPN.week,
+            orm.PlayerWeekESPN.player_week_id,
+        )
+        .join(orm.PlayerSeason)
+        .where(orm.PlayerSeason.season == season)
+    ).all()
+    return {
+        (player_season_id, week): player_week_id
+        for player_season_id, week, player_week_id in rows
+    }
+
+
 def get_league_season_by_platform_league_id(
     league_id: str | int, season: int, db: Session = None
 ) -> orm.LeagueSeason:
@@ -218,6 +621,112 @@ def get_league_season_by_platform_league_id(
     return league
 
 
+async def get_league_season_by_platform_league_id_async(
+    league_id: str | int, season: int, db: AsyncSession
+) -> orm.LeagueSeason:
+    try:
+        result = await db.execute(
+            select(orm.LeagueSeason)
+            .where(orm.LeagueSeason.platform_league_id == str(league_id))
+            .where(orm.LeagueSeason.season == season)
+        )
+        league = result.scalar_one_or_none()
+    except:
+        logger.error("Error in getting league by platform league id")
+        await db.rollback()
+        raise
+    return league
+
+
+def bump_league_data_version(
+    season: int, db: Session, league_season_id: int = None
+) -> None:
+    """
+    Marks cached lineup responses of a league season stale, or of every league in
+    the season when no league_season_id is given (e.g. after loading player weeks)
+    """
+    statement = (
+        update(orm.LeagueSeason)
+        .where(orm.LeagueSeason.season == season)
+        .values(data_version=orm.LeagueSeason.data_version + 1)
+    )
+    if league_season_id:
+        statement = statement.where(
+            orm.LeagueSeason.league_season_id == league_season_id
+        )
+    try:
+        db.execute(statement)
+        db.commit()
+    except:
+        db.rollback()
+        raise
+    logger.info(f"Bumped data version of season {season} leagues {league_season_id}")
+
+
+async def get_league_data_version_async(
+    league_id: str | int, season: int, db: AsyncSession
+) -> int | None:
+    result = await db.execute(
+        select(orm.LeagueSeason.data_version)
+        .where(orm.LeagueSeason.platform_league_id == str(league_id))
+        .where(orm.LeagueSeason.season == season)
+    )
+    return result.scalar_one_or_none()
+
+
+def _season_data_version_statement(season: int) -> Select:
+    return select(func.min(orm.LeagueSeason.data_version)).where(
+        orm.LeagueSeason.season == season
+    )
+
+
+def get_season_data_version(season: int, db: Session) -> int:
+    """
+    Lowest data version of the season's leagues, which only moves once every league
+    was bumped, e.g. by loading player weeks (see `bump_league_data_version`)
+    """
+    return db.execute(_season_data_version_statement(season)).scalar() or 0
+
+
+async def get_season_data_version_async(season: int, db: AsyncSession) -> int:
+    result = await db.execute(_season_data_version_statement(season))
+    return result.scalar() or 0
+
+
+def get_league_week_watermark(league_season_id: int, dataset: str, db: Session) -> int:
+    """
+    Last week of `dataset` loaded for the league season, 0 if it never was
+    """
+    week = db.scalar(
+        select(orm.LeagueWeekWatermark.week).where(
+            orm.LeagueWeekWatermark.league_season_id == league_season_id,
+            orm.LeagueWeekWatermark.dataset == dataset,
+        )
+    )
+    return week or 0
+
+
+def set_league_week_watermark(
+    league_season_id: int, dataset: str, week: int, db: Session
+) -> None:
+    stmt = pg_insert(orm.LeagueWeekWatermark).values(
+        league_season_id=league_season_id, dataset=dataset, week=week
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["league_season_id", "dataset"],
+        set_={"week": stmt.excluded.week, "updated_at": func.now()},
+    )
+    try:
+        db.execute(stmt)
+        db.commit()
+    except:
+        db.rollback()
+        raise
+    logger.info(
+        f"Set {dataset} watermark of league season {league_season_id} to week {week}"
+    )
+
+
 def delete_all_rows(table: orm.Base, db=None):
     new_session = False
     if db is None:
@@ -234,6 +743,201 @@ def delete_all_rows(table: orm.Base, db=None):
             db.close()
 
 
+def get_league_seasons_with_points(season: int, db: Session) -> List[orm.LeagueSeason]:
+    """
+    Returns the season's leagues with materialized points, i.e. whose points go stale
+    when player weeks change
+    """
+    return (
+        db.execute(
+            select(orm.LeagueSeason).where(
+                orm.LeagueSeason.season == season,
+                select(orm.LeaguePlayerWeekPoints.league_season_id)
+                .where(
+                    orm.LeaguePlayerWeekPoints.league_season_id
+                    == orm.LeagueSeason.league_season_id
+                )
+                .exists(),
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+
+def get_stale_league_player_weeks(
+    league_season_id: int,
+    season: int,
+    scoring_config_hash: str,
+    stat_columns: List[str],
+    player_week_ids: List[int] = None,
+    db: Session = None,
+) -> List[Any]:
+    """
+    Returns (player_week_id, *stat_columns) rows for a season's player weeks that
+    have no materialized points for the league, or were scored under another config
+    """
+    if db is None:
+        logger.error("No valid db was supplied to method to get stale player weeks!")
+        return None
+    try:
+        stale_filter = or_(
+            orm.LeaguePlayerWeekPoints.player_week_id.is_(None),
+            orm.LeaguePlayerWeekPoints.scoring_config_hash != scoring_config_hash,
+        )
+        if player_week_ids:
+            stale_filter = or_(
+                stale_filter, orm.PlayerWeekESPN.player_week_id.in_(player_week_ids)
+            )
+        rows = (
+            db.query(
+                orm.PlayerWeekESPN.player_week_id,
+                *[getattr(orm.PlayerWeekESPN, column) for column in stat_columns],
+            )
+            .join(
+                orm.PlayerSeason,
+                orm.PlayerWeekESPN.player_season_id
+                == orm.PlayerSeason.player_season_id,
+            )
+            .outerjoin(
+                orm.LeaguePlayerWeekPoints,
+                (
+                    orm.PlayerWeekESPN.player_week_id
+                    == orm.LeaguePlayerWeekPoints.player_week_id
+                )
+                & (orm.LeaguePlayerWeekPoints.league_season_id == league_season_id),
+            )
+            .filter(orm.PlayerSeason.season == season, stale_filter)
+            .all()
+        )
+    except:
+        logger.error("Error in getting stale player weeks for league points")
+        db.rollback()
+        raise
+    return rows
+
+
+def bulk_upsert_league_player_week_points(
+    records: List[Dict], db: Session = None
+) -> List[Dict]:
+    if db is None:
+        logger.error(
+            "No valid db was supplied to method to bulk upsert league player week points!"
+        )
+        return None
+    if not records:
+        logger.info("No records to upsert for league player week points")
+        return []
+    try:
+        stmt = pg_insert(orm.LeaguePlayerWeekPoints).values(records)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["league_season_id", "player_week_id"],
+            set_={
+                "points": stmt.excluded.points,
+                "points_breakdown": stmt.excluded.points_breakdown,
+                "scoring_config_hash": stmt.excluded.scoring_config_hash,
+            },
+        )
+        db.execute(stmt)
+        db.commit()
+    except Exception as e:
+        logger.error(f"Error in bulk upserting league player week points: {e}")
+        db.rollback()
+        raise
+    logger.info(f"Successfully bulk upserted {len(records)} league player week points")
+    return records
+
+
+def _league_player_week_points_statement(
+    league_season_id: int, player_week_ids: List[int], scoring_config_hash: str
+) -> Select:
+    return select(
+        orm.LeaguePlayerWeekPoints.player_week_id,
+        orm.LeaguePlayerWeekPoints.points,
+    ).where(
+        orm.LeaguePlayerWeekPoints.league_season_id == league_season_id,
+        orm.LeaguePlayerWeekPoints.scoring_config_hash == scoring_config_hash,
+        orm.LeaguePlayerWeekPoints.player_week_id.in_(player_week_ids),
+    )
+
+
+async def get_league_player_week_points_async(
+    league_season_id: int,
+    player_week_ids: List[int],
+    scoring_config_hash: str,
+    db_session: AsyncSession,
+) -> Dict[int, float]:
+    if not player_week_ids:
+        return {}
+    result = await db_session.execute(
+        _league_player_week_points_statement(
+            league_season_id, player_week_ids, scoring_config_hash
+        )
+    )
+    return {player_week_id: points for player_week_id, points in result.all()}
+
+
+def _season_player_week_stats_statement(season: int) -> Select:
+    return (
+        select(
+            orm.PlayerWeekESPN.player_season_id,
+            orm.PlayerWeekESPN.week,
+            *PLAYER_WEEK_STAT_COLUMNS,
+        )
+        .join(
+            orm.PlayerSeason,
+            orm.PlayerWeekESPN.player_season_id == orm.PlayerSeason.player_season_id,
+        )
+        .where(orm.PlayerSeason.season == season)
+    )
+
+
+def get_season_player_week_stats(season: int, db_session: Session) -> List[Row]:
+    """
+    Every player week of a season as (player_season_id, week, *stat columns) rows
+    """
+    return db_session.execute(_season_player_week_stats_statement(season)).all()
+
+
+async def get_season_player_week_stats_async(
+    season: int, db_session: AsyncSession
+) -> List[Row]:
+    result = await db_session.execute(_season_player_week_stats_statement(season))
+    return result.all()
+
+
+# Joins from each season-scoped table to the season it belongs to
+SEASON_TABLE_JOINS = {
+    orm.Player: ([orm.PlayerSeason], orm.PlayerSeason.season),
+    orm.PlayerSeason: ([], orm.PlayerSeason.season),
+    orm.PlayerWeekESPN: ([orm.PlayerSeason], orm.PlayerSeason.season),
+    orm.LeagueSeason: ([], orm.LeagueSeason.season),
+    orm.LeagueTeam: ([orm.LeagueSeason], orm.LeagueSeason.season),
+    orm.DraftTeam: ([orm.LeagueTeam, orm.LeagueSeason], orm.LeagueSeason.season),
+    orm.LeagueWeeklyTeam: (
+        [orm.LeagueTeam, orm.LeagueSeason],
+        orm.LeagueSeason.season,
+    ),
+}
+
+
+def stream_season_table_rows(
+    record_type: orm.Base, season: int, db_session: Session, chunk_size: int = 10000
+) -> Iterator[List[Row]]:
+    """
+    Yields a season's rows of a `SEASON_TABLE_JOINS` table in chunks, all columns in
+    table order, streamed through a server-side cursor
+    """
+    joins, season_column = SEASON_TABLE_JOINS[record_type]
+    statement = select(*record_type.__table__.columns).select_from(record_type)
+    for join in joins:
+        statement = statement.join(join)
+    statement = statement.where(season_column == season)
+    result = db_session.execute(statement.execution_options(yield_per=chunk_size))
+    for rows in result.partitions():
+        yield rows
+
+
 def get_weekly_team_players(
     platform_league_id: str,
     platform_team_id: str,
@@ -272,6 +976,11 @@ def get_weekly_team_players(
             orm.LeagueSeason.platform_league_id == platform_league_id,
             orm.LeagueSeason.season == season,
             orm.LeagueTeam.platform_team_id == platform_team_id,
+            orm.PlayerSeason.season == season,
+        )
+        # Only load the season and weeks matched above, not every season's weeks
+        .options(
+            contains_eager(orm.Player.seasons).contains_eager(orm.PlayerSeason.weeks)
         )
     )
 
@@ -339,18 +1048,247 @@ def get_draft_team_players(
             orm.LeagueTeam.league_season_id == orm.LeagueSeason.league_season_id,
         )
         .join(orm.Platform, orm.LeagueSeason.platform_id == orm.Platform.platform_id)
+        .outerjoin(
+            orm.PlayerSeason,
+            (orm.Player.player_id == orm.PlayerSeason.player_id)
+            & (orm.PlayerSeason.season == season),
+        )
+        .outerjoin(
+            orm.PlayerWeekESPN,
+            (orm.PlayerSeason.player_season_id == orm.PlayerWeekESPN.player_season_id)
+            & (orm.PlayerWeekESPN.week == week if week else true()),
+        )
         .filter(
             orm.Platform.platform_name == "ESPN",
             orm.LeagueSeason.platform_league_id == platform_league_id,
             orm.LeagueSeason.season == season,
             orm.LeagueTeam.platform_team_id == platform_team_id,
         )
+        # Only load the requested season and week, not every season's weeks
+        .options(
+            contains_eager(orm.Player.seasons).contains_eager(orm.PlayerSeason.weeks)
+        )
     )
-    if week:
-        query = query.filter(orm.PlayerSeason.season == week)
     return query.all()
 
 
+def _league_teams_statement(league_season_id: int) -> Select:
+    return (
+        select(orm.LeagueTeam)
+        .where(orm.LeagueTeam.league_season_id == league_season_id)
+        .order_by(orm.LeagueTeam.platform_team_id)
+    )
+
+
+async def get_league_teams_async(
+    league_season_id: int, db_session: AsyncSession
+) -> List[orm.LeagueTeam]:
+    result = await db_session.scalars(_league_teams_statement(league_season_id))
+    return result.all()
+
+
+# ========
+# Lean read path for the lineup endpoints
+# - Selects only the needed columns as named tuple rows, so none of the joined eager
+#   relationships of the ORM models are loaded. ORM objects stay for ETL writes
+# ========
+def _weekly_lineup_rows_statement(
+    platform_league_id: str,
+    season: int,
+    platform_team_id: str = None,
+    week: int = None,
+    with_stats: bool = True,
+) -> Select:
+    statement = (
+        select(
+            orm.LeagueTeam.platform_team_id,
+            orm.Player.player_id,
+            orm.Player.first_name,
+            orm.Player.last_name,
+            orm.PlayerSeason.position,
+            orm.PlayerSeason.player_season_id,
+            orm.PlayerWeekESPN.player_week_id,
+            orm.PlayerWeekESPN.week,
+            orm.LeagueWeeklyTeam.lineup_position,
+            *(PLAYER_WEEK_STAT_COLUMNS if with_stats else []),
+        )
+        .select_from(orm.LeagueWeeklyTeam)
+        .join(
+            orm.LeagueTeam,
+            orm.LeagueWeeklyTeam.league_team_id == orm.LeagueTeam.league_team_id,
+        )
+        .join(
+            orm.LeagueSeason,
+            orm.LeagueTeam.league_season_id == orm.LeagueSeason.league_season_id,
+        )
+        .join(orm.Platform, orm.LeagueSeason.platform_id == orm.Platform.platform_id)
+        .join(
+            orm.PlayerWeekESPN,
+            orm.LeagueWeeklyTeam.player_week_id == orm.PlayerWeekESPN.player_week_id,
+        )
+        .join(
+            orm.PlayerSeason,
+            orm.PlayerWeekESPN.player_season_id == orm.PlayerSeason.player_season_id,
+        )
+        .join(orm.Player, orm.PlayerSeason.player_id == orm.Player.player_id)
+        .where(
+            orm.Platform.platform_name == "ESPN",
+            orm.LeagueSeason.platform_league_id == platform_league_id,
+            orm.LeagueSeason.season == season,
+            orm.PlayerSeason.season == season,
+        )
+    )
+    if platform_team_id:
+        statement = statement.where(orm.LeagueTeam.platform_team_id == platform_team_id)
+    if week:
+        statement = statement.where(orm.PlayerWeekESPN.week == week)
+    return statement
+
+
+def get_weekly_lineup_rows(
+    platform_league_id: str,
+    season: int,
+    db_session: Session,
+    platform_team_id: str = None,
+    week: int = None,
+    with_stats: bool = True,
+) -> List[Row]:
+    """
+    One row per weekly roster spot of a league's teams, or of a single team
+    - Columns: platform_team_id, player_id, first_name, last_name, position,
+      player_season_id, player_week_id, week, lineup_position and, unless
+      `with_stats` is False, every stat column
+    - The sync version is only kept for db/benchmarks.py
+    """
+    return db_session.execute(
+        _weekly_lineup_rows_statement(
+            platform_league_id,
+            season,
+            platform_team_id=platform_team_id,
+            week=week,
+            with_stats=with_stats,
+        )
+    ).all()
+
+
+async def get_weekly_lineup_rows_async(
+    platform_league_id: str,
+    season: int,
+    db_session: AsyncSession,
+    platform_team_id: str = None,
+    week: int = None,
+    with_stats: bool = True,
+) -> List[Row]:
+    result = await db_session.execute(
+        _weekly_lineup_rows_statement(
+            platform_league_id,
+            season,
+            platform_team_id=platform_team_id,
+            week=week,
+            with_stats=with_stats,
+        )
+    )
+    return result.all()
+
+
+def _draft_lineup_rows_statement(
+    platform_league_id: str,
+    season: int,
+    platform_team_id: str = None,
+    week: int = None,
+    with_stats: bool = True,
+) -> Select:
+    statement = (
+        select(
+            orm.LeagueTeam.platform_team_id,
+            orm.Player.player_id,
+            orm.Player.first_name,
+            orm.Player.last_name,
+            orm.PlayerSeason.position,
+            orm.PlayerSeason.player_season_id,
+            orm.PlayerWeekESPN.player_week_id,
+            orm.PlayerWeekESPN.week,
+            *(PLAYER_WEEK_STAT_COLUMNS if with_stats else []),
+        )
+        .select_from(orm.DraftTeam)
+        .join(
+            orm.LeagueTeam,
+            orm.DraftTeam.league_team_id == orm.LeagueTeam.league_team_id,
+        )
+        .join(
+            orm.LeagueSeason,
+            orm.LeagueTeam.league_season_id == orm.LeagueSeason.league_season_id,
+        )
+        .join(orm.Platform, orm.LeagueSeason.platform_id == orm.Platform.platform_id)
+        .join(orm.Player, orm.DraftTeam.player_id == orm.Player.player_id)
+        .outerjoin(
+            orm.PlayerSeason,
+            (orm.PlayerSeason.player_id == orm.Player.player_id)
+            & (orm.PlayerSeason.season == season),
+        )
+        .outerjoin(
+            orm.PlayerWeekESPN,
+            (orm.PlayerSeason.player_season_id == orm.PlayerWeekESPN.player_season_id)
+            & (orm.PlayerWeekESPN.week == week if week else true()),
+        )
+        .where(
+            orm.Platform.platform_name == "ESPN",
+            orm.LeagueSeason.platform_league_id == platform_league_id,
+            orm.LeagueSeason.season == season,
+        )
+    )
+    if platform_team_id:
+        statement = statement.where(orm.LeagueTeam.platform_team_id == platform_team_id)
+    return statement
+
+
+def get_draft_lineup_rows(
+    platform_league_id: str,
+    season: int,
+    db_session: Session,
+    platform_team_id: str = None,
+    week: int = None,
+    with_stats: bool = True,
+) -> List[Row]:
+    """
+    One row per season week (or the given week) of every drafted player of a
+    league's teams, or of a single team
+    - Same columns as `get_weekly_lineup_rows`, without lineup_position
+    - Drafted players without a player_season or player weeks get a single row with
+      NULL position or player_week_id
+    - The sync version is only kept for db/benchmarks.py
+    """
+    return db_session.execute(
+        _draft_lineup_rows_statement(
+            platform_league_id,
+            season,
+            platform_team_id=platform_team_id,
+            week=week,
+            with_stats=with_stats,
+        )
+    ).all()
+
+
+async def get_draft_lineup_rows_async(
+    platform_league_id: str,
+    season: int,
+    db_session: AsyncSession,
+    platform_team_id: str = None,
+    week: int = None,
+    with_stats: bool = True,
+) -> List[Row]:
+    result = await db_session.execute(
+        _draft_lineup_rows_statement(
+            platform_league_id,
+            season,
+            platform_team_id=platform_team_id,
+            week=week,
+            with_stats=with_stats,
+        )
+    )
+    return result.all()
+
+
 def get_draft_team_weekly_espn_rows(
     platform_league_id: str,
     platform_team_id: str,
@@ -1,14 +1,89 @@
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, List, Dict
 
 import espn_api
-from espn_api.football import League
+import requests
+from espn_api.football import League, Player
+from espn_api.requests.constant import FANTASY_BASE_ENDPOINT
+from espn_api.requests.espn_requests import EspnFantasyRequests, checkRequestStatus
 from ffwrapped_be.config import config
+from ffwrapped_be.etl.extractors.http_cache import cached_get
 
 logger = logging.getLogger(__name__)
 
 
+class RateLimiter:
+    """
+    Spaces calls at least 1 / `per_second` apart, across threads
+    """
+
+    def __init__(self, per_second: float):
+        self.interval = 1 / per_second if per_second > 0 else 0
+        self._next_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            wait_until = max(self._next_at, now)
+            self._next_at = wait_until + self.interval
+        time.sleep(max(wait_until - now, 0))
+
+
+class CachedEspnFantasyRequests(EspnFantasyRequests):
+    """
+    espn_api's requests, going through the extractors' HTTP cache
+    - Requests that reach ESPN wait on `rate_limiter`, if set
+    """
+
+    rate_limiter: RateLimiter = None
+
+    def _fetch(self, url: str, **kwargs) -> requests.Response:
+        if self.rate_limiter:
+            self.rate_limiter.wait()
+        return requests.get(url, **kwargs)
+
+    def league_get(self, params: dict = None, headers: dict = None, extend: str = ""):
+        endpoint = self.LEAGUE_ENDPOINT + extend
+        r = cached_get(
+            endpoint,
+            params=params,
+            headers=headers,
+            cookies=self.cookies,
+            fetch=self._fetch,
+        )
+        checkRequestStatus(
+            r.status_code, cookies=self.cookies, league_id=self.league_id
+        )
+
+        if self.logger:
+            self.logger.log_request(
+                endpoint=endpoint, params=params, headers=headers, response=r.json()
+            )
+        return r.json() if self.year > 2017 else r.json()[0]
+
+    def get(self, params: dict = None, headers: dict = None, extend: str = ""):
+        endpoint = self.ENDPOINT + extend
+        r = cached_get(
+            endpoint,
+            params=params,
+            headers=headers,
+            cookies=self.cookies,
+            fetch=self._fetch,
+        )
+        checkRequestStatus(r.status_code)
+
+        if self.logger:
+            self.logger.log_request(
+                endpoint=endpoint, params=params, headers=headers, response=r.json()
+            )
+        return r.json()
+
+
 class ESPNExtractor:
     def __init__(self, league_id: int, year: int, espn_s2: str, swid: str):
         self.league = League(
@@ -16,7 +91,27 @@ class ESPNExtractor:
             year=year,
             espn_s2=config.espn_s2,
             swid=config.espn_swid,
+            fetch_league=False,
+        )
+        self.league.espn_request = CachedEspnFantasyRequests(
+            sport="nfl",
+            year=year,
+            league_id=league_id,
+            cookies=self.league.espn_request.cookies,
+            logger=self.league.logger,
         )
+        self.league.espn_request.rate_limiter = RateLimiter(
+            config.espn_requests_per_second
+        )
+        if config.espn_base_url:
+            # espn_api builds its endpoints from a fixed root
+            base_url = config.espn_base_url.rstrip("/") + "/"
+            request = self.league.espn_request
+            request.ENDPOINT = request.ENDPOINT.replace(FANTASY_BASE_ENDPOINT, base_url)
+            request.LEAGUE_ENDPOINT = request.LEAGUE_ENDPOINT.replace(
+                FANTASY_BASE_ENDPOINT, base_url
+            )
+        self.league.fetch_league()
 
     def extract_league(self) -> League:
         return self.league
@@ -24,6 +119,63 @@ class ESPNExtractor:
     def extract_teams(self) -> List[Dict]:
         return self.league.teams
 
+    def extract_player_cards(self, espn_ids: List[int]) -> List[Player]:
+        """
+        `league.player_info` for many ids in one request
+        - Skips `player_info`'s pro schedule request, so players have no `schedule`
+        """
+        data = self.league.espn_request.get_player_card(
+            espn_ids, self.league.finalScoringPeriod
+        )
+        players = [Player(player, self.league.year) for player in data["players"]]
+        missing = set(espn_ids) - {player.playerId for player in players}
+        if missing:
+            logger.warning(f"ESPN returned no player card for ids {sorted(missing)}")
+        return players
+
+    def iter_player_cards(
+        self,
+        espn_ids: List[int],
+        batch_size: int = None,
+        workers: int = None,
+    ) -> Iterator[List[Player]]:
+        """
+        Fetches player cards `batch_size` ids per request on a thread pool, yielding
+        each batch's players as it arrives
+        - At most `2 * workers` batches are fetched ahead of the caller, so a slow
+          consumer (e.g. the db loader) holds back fetching instead of memory piling up
+        - Requests are capped at `config.espn_requests_per_second` across workers,
+          while ones the HTTP cache answers aren't
+        """
+        batch_size = batch_size or config.espn_player_batch_size
+        workers = workers or config.espn_fetch_workers
+        batches = iter(
+            [
+                espn_ids[start : start + batch_size]
+                for start in range(0, len(espn_ids), batch_size)
+            ]
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="espn-fetch"
+        ) as executor:
+            pending = set()
+            try:
+                while True:
+                    while len(pending) < 2 * workers:
+                        batch = next(batches, None)
+                        if batch is None:
+                            break
+                        pending.add(executor.submit(self.extract_player_cards, batch))
+                    if not pending:
+                        return
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
 
 if __name__ == "__main__":
     extractor = ESPNExtractor(
@@ -0,0 +1,193 @@
+"""
+On-disk cache of the extractors' HTTP GETs, enabled by setting `HTTP_CACHE_DIR`
+
+    <dir>/requests/<request sha256>.json   status, headers and validators of a GET
+    <dir>/bodies/<content sha256>.gz       gzipped response bodies, shared by requests
+
+- record mode (default): serves responses younger than `HTTP_CACHE_TTL_SECONDS`,
+  revalidates older ones with ETag / Last-Modified, and records new ones
+- replay mode: serves recorded responses of any age and never touches the
+  network, a request that wasn't recorded raises `ReplayMiss`
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from ffwrapped_be.config import config
+
+logger = logging.getLogger(__name__)
+
+# Request headers that differ between machines but not in what they return
+UNKEYED_HEADERS = {"authorization", "cookie", "x-rapidapi-key"}
+# Response headers kept with a recorded response
+RECORDED_HEADERS = ["Content-Type", "ETag", "Last-Modified"]
+
+
+class ReplayMiss(Exception):
+    pass
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class HttpCache:
+    def __init__(self, directory: str, ttl_seconds: float, replay: bool = False):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.replay = replay
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def request_key(self, url: str, params: Dict = None, headers: Dict = None) -> str:
+        prepared = requests.Request("GET", url, params=params).prepare()
+        keyed_headers = {
+            name.lower(): value
+            for name, value in (headers or {}).items()
+            if name.lower() not in UNKEYED_HEADERS
+        }
+        return hashlib.sha256(
+            json.dumps([prepared.url, keyed_headers], sort_keys=True).encode()
+        ).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, "requests", key[:2], f"{key}.json")
+
+    def _body_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "bodies", digest[:2], f"{digest}.gz")
+
+    def _read_entry(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._entry_path(key)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _record(self, key: str, response: requests.Response) -> Dict:
+        digest = hashlib.sha256(response.content).hexdigest()
+        if not os.path.exists(self._body_path(digest)):
+            _write_atomic(self._body_path(digest), gzip.compress(response.content))
+        entry = {
+            "url": response.url,
+            "status_code": response.status_code,
+            "encoding": response.encoding,
+            "headers": {
+                name: response.headers[name]
+                for name in RECORDED_HEADERS
+                if name in response.headers
+            },
+            "body": digest,
+            "fetched_at": time.time(),
+        }
+        _write_atomic(self._entry_path(key), json.dumps(entry).encode())
+        return entry
+
+    def _response(self, entry: Dict) -> requests.Response:
+        response = requests.Response()
+        response.url = entry["url"]
+        response.status_code = entry["status_code"]
+        response.encoding = entry["encoding"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        with gzip.open(self._body_path(entry["body"])) as f:
+            response._content = f.read()
+        return response
+
+    def get(
+        self,
+        url: str,
+        params: Dict = None,
+        headers: Dict = None,
+        cookies: Dict = None,
+        fetch: Callable[..., requests.Response] = requests.get,
+    ) -> requests.Response:
+        """
+        `fetch(url, params=, headers=, cookies=)` through the cache
+        - Only 200 responses are recorded, others are returned as they come
+        """
+        key = self.request_key(url, params, headers)
+        entry = self._read_entry(key)
+        if self.replay:
+            if entry is None:
+                raise ReplayMiss(f"No recorded response for GET {url} {params}")
+            self.hits += 1
+            return self._response(entry)
+        if entry is not None and time.time() - entry["fetched_at"] < self.ttl_seconds:
+            self.hits += 1
+            return self._response(entry)
+
+        conditional_headers = dict(headers or {})
+        if entry is not None:
+            if "ETag" in entry["headers"]:
+                conditional_headers["If-None-Match"] = entry["headers"]["ETag"]
+            if "Last-Modified" in entry["headers"]:
+                conditional_headers["If-Modified-Since"] = entry["headers"][
+                    "Last-Modified"
+                ]
+        response = fetch(
+            url, params=params, headers=conditional_headers, cookies=cookies
+        )
+        if response.status_code == 304 and entry is not None:
+            self.revalidated += 1
+            entry["fetched_at"] = time.time()
+            _write_atomic(self._entry_path(key), json.dumps(entry).encode())
+            return self._response(entry)
+        self.misses += 1
+        if response.status_code == 200:
+            self._record(key, response)
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+        }
+
+
+_http_cache: Optional[HttpCache] = None
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """
+    The configured cache, or None when `HTTP_CACHE_DIR` is unset
+    """
+    global _http_cache
+    if _http_cache is None and config.http_cache_dir:
+        if config.http_cache_mode not in ("record", "replay"):
+            raise ValueError(f"Unknown HTTP_CACHE_MODE {config.http_cache_mode}")
+        _http_cache = HttpCache(
+            config.http_cache_dir,
+            config.http_cache_ttl_seconds,
+            replay=config.http_cache_mode == "replay",
+        )
+    return _http_cache
+
+
+def cached_get(
+    url: str,
+    params: Dict = None,
+    headers: Dict = None,
+    cookies: Dict = None,
+    fetch: Callable[..., requests.Response] = requests.get,
+) -> requests.Response:
+    """
+    `HttpCache.get` through the configured cache, or straight `fetch` without one
+    """
+    http_cache = get_http_cache()
+    if http_cache is None:
+        return fetch(url, params=params, headers=headers, cookies=cookies)
+    return http_cache.get(url, params, headers, cookies, fetch)
@@ -1,11 +1,11 @@
-import logging
-import requests
 import json
+import logging
 import os
 from abc import ABC, abstractmethod
 from typing import List, Dict
 
 from ffwrapped_be.config import config
+from ffwrapped_be.etl.extractors.http_cache import cached_get, get_http_cache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,31 +15,46 @@ class RapidTankExtractor:
     def __init__(self):
         self.base_url = config.rapid_api_tank_url
 
+    def _fetch_players(self) -> Dict:
+        player_list_endpoint = "/getNFLPlayerList"
+        url = self.base_url + player_list_endpoint
+        headers = {
+            "x-rapidapi-host": config.rapid_api_host,
+            "x-rapidapi-key": config.rapid_api_key,
+        }
+        logger.info("Retrieving NFL player data...")
+        response = cached_get(url, headers=headers)
+        if response.status_code != 200 or not response.json():
+            raise Exception(
+                f"Failed to retrieve NFL player data: {response.status_code}"
+            )
+        return response.json()
+
     def get_players(self) -> List[Dict]:
+        """
+        - Goes through the HTTP cache when `HTTP_CACHE_DIR` is set
+        - Otherwise the player list is kept in etl/data/nfl_player_data.json, so the
+          paid API is only called once
+        """
+        if get_http_cache() is not None:
+            return self._fetch_players()["body"]
+
         dir_path = os.path.dirname(os.path.realpath(__file__))
         json_file_path = os.path.join(dir_path, "../data/nfl_player_data.json")
-
         logger.info(
             f"Searching for json file of nfl player data at path {json_file_path}..."
         )
-        if not os.path.exists(json_file_path):
-            logger.info("JSON of nfl player data not found, retrieving now...")
-            player_list_endpoint = "/getNFLPlayerList"
-            url = self.base_url + player_list_endpoint
-            headers = {
-                "x-rapidapi-host": config.rapid_api_host,
-                "x-rapidapi-key": config.rapid_api_key,
-            }
-            response = requests.get(url, headers=headers)
-
-            if response.status_code == 200 and response.json():
-                json_data = response.json()
-                with open(json_file_path, "w") as f:
-                    json.dump(json_data, f)
-                logger.info("JSON of NFL player data retrieved and saved.")
-        else:
+        if os.path.exists(json_file_path):
             logger.info("JSON of nfl player data already exists, importing.")
-            json_data = json.load(open(json_file_path, "r"))
+            with open(json_file_path, "r") as f:
+                json_data = json.load(f)
+        else:
+            logger.info("JSON of nfl player data not found, retrieving now...")
+            json_data = self._fetch_players()
+            os.makedirs(os.path.dirname(json_file_path), exist_ok=True)
+            with open(json_file_path, "w") as f:
+                json.dump(json_data, f)
+            logger.info("JSON of NFL player data retrieved and saved.")
         return json_data["body"]
 
 
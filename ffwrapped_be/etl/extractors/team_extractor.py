@@ -7,14 +7,15 @@ from ffwrapped_be.config import config
 from bs4 import BeautifulSoup
 from ratelimit import limits
 from ffwrapped_be.etl.utils import custom_sleep_and_retry
+from ffwrapped_be.etl.extractors.http_cache import cached_get
 
 logger = logging.getLogger(__name__)
 
 @custom_sleep_and_retry
 @limits(calls=4, period=20)
-def limited_pfref_request(url):
+def limited_pfref_request(url, **kwargs):
     time.sleep(2)
-    return requests.get(url)
+    return requests.get(url, **kwargs)
 
 class Extractor(ABC):
     @abstractmethod
@@ -30,7 +31,7 @@ class TeamExtractor(Extractor):
         self.url = config.pfref_base + '/teams/'
         
     def extract(self) -> List[Dict]:
-        page = limited_pfref_request(self.url)
+        page = cached_get(self.url, fetch=limited_pfref_request)
         
         if page.status_code == 200:
             soup = BeautifulSoup(page.content, 'html.parser')
@@ -77,7 +78,7 @@ class TeamDetailExtractor(Extractor):
         self.url = config.pfref_base + '/teams/' + team_abbrv
     
     def extract(self) -> List[Dict]:
-        page = limited_pfref_request(self.url)
+        page = cached_get(self.url, fetch=limited_pfref_request)
         
         if page.status_code == 200:
             soup = BeautifulSoup(page.content, 'html.parser')
@@ -13,26 +13,27 @@ from ffwrapped_be.etl.utils import (
     WEEKLY_PLAYER_EXTRACTOR_HEADER_COLS,
 )
 from ffwrapped_be.etl.extractors.team_extractor import Extractor
+from ffwrapped_be.etl.extractors.http_cache import cached_get
 
 logger = logging.getLogger(__name__)
 
 
 @custom_sleep_and_retry
 @limits(calls=9, period=30)
-def limited_pfref_request(session, url):
+def limited_pfref_request(session, url, **kwargs):
     time.sleep(1)
     logger.info(f"Session is {session}")
-    return session.get(url)
+    return session.get(url, **kwargs)
 
 
 class WeeklyStatheadExtractor(Extractor):
     def __init__(self):
         self.stathead_base_url = config.stathead_base
 
-        # Set up request session to login
+        # Set up request session, logged in on its first request past the cache
         self.login_url = self.stathead_base_url + "/users/login.cgi"
         self.session = requests.Session()
-        self.login()
+        self.logged_in = False
 
         # Define offset increment for pagination
         self.offset_increment = 200
@@ -53,6 +54,12 @@ class WeeklyStatheadExtractor(Extractor):
         else:
             logger.error("Failed to log in")
             raise Exception(f"Login failed: {response.status_code}, {response.text}")
+        self.logged_in = True
+
+    def _fetch(self, url: str, **kwargs) -> requests.Response:
+        if not self.logged_in:
+            self.login()
+        return limited_pfref_request(self.session, url, **kwargs)
 
     def extract(self, year: int, offset=0) -> List[Dict]:
         """
@@ -69,7 +76,7 @@ class WeeklyStatheadExtractor(Extractor):
         return all_data
 
     def _webscrape_table_rows(self, offset_url: str) -> List[Any]:
-        page = limited_pfref_request(self.session, offset_url)
+        page = cached_get(offset_url, fetch=self._fetch)
 
         if page.status_code == 200:
             soup = BeautifulSoup(page.content, "html.parser")
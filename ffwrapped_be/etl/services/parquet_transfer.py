@@ -0,0 +1,182 @@
+"""
+Moves whole seasons between databases as Parquet, partitioned by season
+
+    poetry run python -m ffwrapped_be.etl.services.parquet_transfer export <dir> 2023 2024
+    poetry run python -m ffwrapped_be.etl.services.parquet_transfer import <dir> [2024]
+
+Files are laid out as <dir>/<table>/season=<season>/part-0.parquet
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+from typing import List
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from sqlalchemy import Column, Date, Float, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
+
+from ffwrapped_be.app.data_models import orm
+from ffwrapped_be.db import databases as db
+
+logger = logging.getLogger(__name__)
+
+# In foreign key order, so importing them in turn never orphans a row
+TRANSFER_TABLES = [
+    orm.Player,
+    orm.PlayerSeason,
+    orm.PlayerWeekESPN,
+    orm.LeagueSeason,
+    orm.LeagueTeam,
+    orm.DraftTeam,
+    orm.LeagueWeeklyTeam,
+]
+
+
+def _arrow_type(column: Column) -> pa.DataType:
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, Date):
+        return pa.date32()
+    if isinstance(column.type, (String, JSONB)):
+        # JSONB is kept as its JSON text, which COPY parses back
+        return pa.string()
+    raise ValueError(f"No Parquet type for column {column} of type {column.type}")
+
+
+def _partition_path(directory: str, table_name: str, season: int) -> str:
+    return os.path.join(directory, table_name, f"season={season}", "part-0.parquet")
+
+
+class ParquetTransfer:
+    def __init__(self, chunk_size: int = 50000):
+        self.chunk_size = chunk_size
+        self.db = db.EtlSessionLocal()
+
+    def close(self):
+        self.db.close()
+        logger.info("Closed database session")
+
+    def export_table_season(
+        self, record_type: orm.Base, season: int, directory: str
+    ) -> int:
+        """
+        Streams a season of a table into one Parquet file, a row group per chunk
+        """
+        table = record_type.__table__
+        schema = pa.schema([(c.name, _arrow_type(c)) for c in table.columns])
+        json_columns = {
+            index
+            for index, column in enumerate(table.columns)
+            if isinstance(column.type, JSONB)
+        }
+        path = _partition_path(directory, table.name, season)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        row_count = 0
+        with pq.ParquetWriter(path + ".tmp", schema) as writer:
+            for rows in db.stream_season_table_rows(
+                record_type, season, self.db, self.chunk_size
+            ):
+                columns = [list(values) for values in zip(*rows)]
+                for index in json_columns:
+                    columns[index] = [
+                        None if value is None else json.dumps(value)
+                        for value in columns[index]
+                    ]
+                writer.write_batch(pa.record_batch(columns, schema=schema))
+                row_count += len(rows)
+        os.replace(path + ".tmp", path)
+        logger.info(f"Exported {row_count} {table.name} rows of season {season}")
+        return row_count
+
+    def export_seasons(self, directory: str, seasons: List[int]) -> None:
+        for record_type in TRANSFER_TABLES:
+            for season in seasons:
+                self.export_table_season(record_type, season, directory)
+
+    def import_table_season(
+        self, record_type: orm.Base, season: int, directory: str
+    ) -> int:
+        """
+        COPYs a season's Parquet file into its table in chunks, keeping rows' ids
+        - Rows whose primary key already exists are skipped, so re-running an import
+          is safe. Any other conflict, e.g. a player with the same pfref_id under
+          another player_id, fails the import of the table
+        """
+        table_name = record_type.__table__.name
+        path = _partition_path(directory, table_name, season)
+        if not os.path.exists(path):
+            logger.info(f"No {table_name} file for season {season}, skipping")
+            return 0
+
+        inserted = 0
+        parquet_file = pq.ParquetFile(path)
+        try:
+            for batch in parquet_file.iter_batches(batch_size=self.chunk_size):
+                csv_file = io.BytesIO()
+                pa_csv.write_csv(
+                    batch, csv_file, pa_csv.WriteOptions(include_header=False)
+                )
+                csv_file.seek(0)
+                inserted += db.copy_insert_csv(
+                    csv_file, record_type, batch.schema.names, flush=True, db=self.db
+                )
+            db.commit(self.db)
+        finally:
+            parquet_file.close()
+        logger.info(
+            f"Imported {inserted} of {parquet_file.metadata.num_rows} {table_name} "
+            f"rows of season {season}"
+        )
+        return inserted
+
+    def import_seasons(self, directory: str, seasons: List[int] = None) -> None:
+        """
+        Imports the given seasons, or every season found in the directory
+        """
+        if not seasons:
+            seasons = sorted(
+                {
+                    int(partition.split("=", 1)[1])
+                    for record_type in TRANSFER_TABLES
+                    if os.path.isdir(os.path.join(directory, record_type.__tablename__))
+                    for partition in os.listdir(
+                        os.path.join(directory, record_type.__tablename__)
+                    )
+                    if partition.startswith("season=")
+                }
+            )
+        for record_type in TRANSFER_TABLES:
+            for season in seasons:
+                self.import_table_season(record_type, season, directory)
+            # Imported ids bypass the sequences of serial keys
+            if len(record_type.__table__.primary_key.columns) == 1:
+                db.reset_id_sequence(record_type, self.db)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("directory")
+    parser.add_argument("seasons", nargs="*", type=int)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    args = parser.parse_args()
+
+    parquet_transfer = ParquetTransfer(chunk_size=args.chunk_size)
+    try:
+        if args.command == "export":
+            if not args.seasons:
+                parser.error("export needs at least one season")
+            parquet_transfer.export_seasons(args.directory, args.seasons)
+        else:
+            parquet_transfer.import_seasons(args.directory, args.seasons)
+    finally:
+        parquet_transfer.close()
@@ -1,23 +1,21 @@
 import logging
 from enum import Enum
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
+import numpy as np
 from espn_api.base_pick import BasePick
-from espn_api.football.box_score import BoxScore
 from espn_api.football import Team, League
 from ffwrapped_be.etl.extractors.espn_extractor import ESPNExtractor
 from ffwrapped_be.db import databases as db
 from ffwrapped_be.config import config
 from ffwrapped_be.app.data_models.orm import (
-    Player,
     LeagueSeason,
     LeagueTeam,
-    DraftTeam,
     PlayerSeason,
     PlayerWeekESPN,
-    LeagueWeeklyTeam,
 )
 from ffwrapped_be.etl import utils
+from ffwrapped_be.app.service import scoring, season_store
 
 logger = logging.getLogger(__name__)
 
@@ -37,13 +35,16 @@ class FantasyPosition(Enum):
 class ESPNTransformLoader:
     def __init__(self, league_id: int, season: int, espn_s2: str, swid: str):
         self.extractor = ESPNExtractor(league_id, season, espn_s2, swid)
-        self.db = db.SessionLocal()
+        self.db = db.EtlSessionLocal()
         self.espn_league: League = self.extractor.extract_league()
-        self.espn_id_to_db_player: Dict[int, Player] = (
-            {}
-        )  # Mapping of ESPN player id to db player id
+        # ESPN player id to the player's player_season_id in the league's season
+        self.espn_id_to_player_season_id: Dict[int, int] = {}
         self._platform_to_league_id_mapping = None
 
+    def close(self):
+        self.db.close()
+        logger.info("Closed database session")
+
     def _get_existing_db_league(self, espn_league: League) -> LeagueSeason:
         try:
             league_db: LeagueSeason = db.get_league_season_by_platform_league_id(
@@ -148,7 +149,11 @@ class ESPNTransformLoader:
             f"Successfully inserted league teams into db for league {self.espn_league.league_id}"
         )
 
-    def transform_load_draft_teams(self) -> None:
+    def transform_load_draft_teams(self) -> List[Tuple[int, int]]:
+        """
+        Upserts the league's draft picks, safe to re-run
+        Returns the (league_team_id, player_id) keys inserted or changed
+        """
         # TODO: refactor to use methods and properties defined
         league = self.espn_league
         league_teams: List[LeagueTeam] = self._get_existing_db_league(
@@ -184,27 +189,40 @@ class ESPNTransformLoader:
             k: pick_dict.get(k, {}) | espn_to_db_map.get(k, {})
             for k in espn_to_db_map.keys()
         }
-        db.bulk_insert(draft_pick_entries.values(), DraftTeam, db=self.db)
+        draft_team_keys = db.bulk_upsert_draft_teams(
+            list(draft_pick_entries.values()), self.db
+        )
         logger.info(
-            f"Successfully inserted draft picks for league {self.espn_league.league_id}"
+            f"Successfully upserted draft picks for league {self.espn_league.league_id}, "
+            f"{len(draft_team_keys)} changed"
         )
+        if draft_team_keys:
+            self._bump_league_data_version()
+        return draft_team_keys
 
-    def _update_espn_id_to_db_player(self, player_espn_ids: List[str]) -> None:
+    def _update_espn_id_to_player_season_id(self, player_espn_ids: List[int]) -> None:
         requested_players = [
-            espn_id
-            for espn_id in player_espn_ids
-            if espn_id not in self.espn_id_to_db_player.keys()
+            str(espn_id)
+            for espn_id in set(player_espn_ids)
+            if espn_id not in self.espn_id_to_player_season_id
         ]
         if requested_players:
-            db_players = db.get_players_by_espn_id(requested_players, self.db)
-            espn_to_db_map = {
-                int(db_player.espn_id): {"db_player_id": db_player}
-                for db_player in db_players
-            }
-            self.espn_id_to_db_player.update(espn_to_db_map)
+            self.espn_id_to_player_season_id.update(
+                db.get_player_season_ids_by_espn_id(
+                    requested_players, self.espn_league.year, self.db
+                )
+            )
         else:
-            logger.info("All requested players already in espn_to_db_map")
-        return
+            logger.info("All requested players already in espn_to_player_season_id")
+
+    def _bump_league_data_version(self) -> None:
+        """
+        Invalidates cached lineup responses of this league
+        """
+        db_league = self._get_existing_db_league(self.espn_league)
+        db.bump_league_data_version(
+            db_league.season, self.db, league_season_id=db_league.league_season_id
+        )
 
     @property
     def platform_to_league_id_mapping(self) -> Dict[int, int]:
@@ -220,122 +238,278 @@ class ESPNTransformLoader:
             self._platform_to_league_id_mapping = platform_to_league_id_mapping
         return self._platform_to_league_id_mapping
 
-    def _transform_load_box_score_team(
-        self, box_score: BoxScore, week: int, home_team: bool
-    ):
-        team = box_score.home_team if home_team else box_score.away_team
-        lineup = box_score.home_lineup if home_team else box_score.away_lineup
-        box_team_desc = "home" if home_team else "away"
-        if not lineup:
-            logger.info(
-                f"No lineup info found for {box_team_desc} team in box score for week {week}"
+    def _transform_load_week_starters(
+        self, week: int, player_week_ids: Dict[Tuple[int, int], int]
+    ) -> List[Tuple[int, int]]:
+        """
+        Upserts every team's lineup of a week at once
+        - Starters without a player week that week get one first, all in one insert,
+          and are added to `player_week_ids`, the (player_season_id, week) index
+        """
+        starters = []
+        for box_score in self.espn_league.box_scores(week):
+            for team, lineup, box_team_desc in (
+                (box_score.home_team, box_score.home_lineup, "home"),
+                (box_score.away_team, box_score.away_lineup, "away"),
+            ):
+                if not lineup:
+                    logger.info(
+                        f"No lineup info found for {box_team_desc} team in box score for week {week}"
+                    )
+                    continue
+                league_team_id = self.platform_to_league_id_mapping[team.team_id]
+                for player in lineup:
+                    if player.lineupSlot not in ["K", "D/ST"]:
+                        position = (
+                            player.lineupSlot
+                            if player.lineupSlot != "RB/WR/TE"
+                            else "FLEX"
+                        )
+                        starters.append((league_team_id, player.playerId, position))
+
+        self._update_espn_id_to_player_season_id(
+            [espn_id for _, espn_id, _ in starters]
+        )
+        unknown_espn_ids = {
+            espn_id
+            for _, espn_id, _ in starters
+            if espn_id not in self.espn_id_to_player_season_id
+        }
+        if unknown_espn_ids:
+            logger.warning(
+                f"Skipping starters with no {self.espn_league.year} player season: "
+                f"{sorted(unknown_espn_ids)}"
             )
-            return
+        missing_player_season_ids = {
+            self.espn_id_to_player_season_id[espn_id]
+            for _, espn_id, _ in starters
+            if espn_id not in unknown_espn_ids
+            and (self.espn_id_to_player_season_id[espn_id], week) not in player_week_ids
+        }
+        if missing_player_season_ids:
+            logger.warning(
+                f"{len(missing_player_season_ids)} starters have no weekly entry for "
+                f"week {week}. Inserting..."
+            )
+            for player_season_id, player_week_id in db.bulk_copy_insert(
+                [
+                    {"player_season_id": player_season_id, "week": week}
+                    for player_season_id in sorted(missing_player_season_ids)
+                ],
+                PlayerWeekESPN,
+                returning=["player_season_id", "player_week_id"],
+                db=self.db,
+            ):
+                player_week_ids[(player_season_id, week)] = player_week_id
 
-        player_espn_ids = [str(player.playerId) for player in lineup]
-        self._update_espn_id_to_db_player(player_espn_ids)
         league_weekly_team_entries = []
-        for player in lineup:
-            if player.lineupSlot not in ["K", "D/ST"]:
-                db_player = self.espn_id_to_db_player.get(player.playerId, {}).get(
-                    "db_player_id", None
-                )
-                if db_player:
-                    player_season: PlayerSeason = [
-                        ps
-                        for ps in db_player.seasons
-                        if ps.season == self.espn_league.year
-                    ][0]
-                    player_week: list[PlayerWeekESPN] = [
-                        w for w in player_season.weeks if w.week == week
-                    ]
-                    if not player_week:
-                        logger.warning(
-                            f"Player {db_player.first_name} {db_player.last_name} does not have a weekly entry for week {week}. Inserting..."
-                        )
-                        new_entry = PlayerWeekESPN(
-                            player_season_id=player_season.player_season_id,
-                            week=week,
-                        )
-                        db.insert_record(new_entry, PlayerWeekESPN, db=self.db)
-                        player_week = [new_entry]
-
-                    position = (
-                        player.lineupSlot if player.lineupSlot != "RB/WR/TE" else "FLEX"
-                    )
-                    weekly_team_member = {
-                        "league_team_id": self.platform_to_league_id_mapping[
-                            team.team_id
-                        ],
-                        "player_week_id": player_week[0].player_week_id,
-                        "lineup_position": position,
-                    }
-                    league_weekly_team_entries.append(weekly_team_member)
+        for league_team_id, espn_id, position in starters:
+            if espn_id in unknown_espn_ids:
+                continue
+            player_season_id = self.espn_id_to_player_season_id[espn_id]
+            league_weekly_team_entries.append(
+                {
+                    "league_team_id": league_team_id,
+                    "player_week_id": player_week_ids[(player_season_id, week)],
+                    "lineup_position": position,
+                }
+            )
         logger.debug(
-            "About to insert %s weekly starters for week %s", box_team_desc, week
-        )
-        db.bulk_insert(
-            league_weekly_team_entries, record_type=LeagueWeeklyTeam, db=self.db
+            "About to upsert %s weekly starters for week %s",
+            len(league_weekly_team_entries),
+            week,
         )
+        return db.bulk_upsert_league_weekly_teams(league_weekly_team_entries, self.db)
+
+    def _last_completed_week(self) -> int:
+        """
+        Last week whose games are all played, the final week once the season is over
+        """
+        league = self.espn_league
+        return min(league.scoringPeriodId - 1, league.finalScoringPeriod)
 
-    def transform_load_weekly_starters(self):
+    def transform_load_weekly_starters(
+        self, full: bool = False
+    ) -> List[Tuple[int, int]]:
+        """
+        - Loads weekly lineups of completed weeks past the league's `weekly_starters`
+          watermark, or of every completed week when `full`
+        Returns the (league_team_id, player_week_id) keys inserted or changed
+        """
         league = self.espn_league
-        for week in range(1, 18):
+        db_league = self._get_existing_db_league(league)
+        watermark = (
+            0
+            if full
+            else db.get_league_week_watermark(
+                db_league.league_season_id, "weekly_starters", self.db
+            )
+        )
+        last_week = min(self._last_completed_week(), 17)
+        if watermark >= last_week:
+            logger.info(f"Weekly starters are loaded through week {last_week} already")
+            return []
+        player_week_ids = db.get_player_week_ids(league.year, self.db)
+        weekly_team_keys = []
+        for week in range(watermark + 1, last_week + 1):
             logger.info("Extracting box scores for week %s", week)
-            box_scores = league.box_scores(week)
-            for box_score in box_scores:
-                self._transform_load_box_score_team(
-                    box_score, week=week, home_team=True
-                )
-                self._transform_load_box_score_team(
-                    box_score, week=week, home_team=False
-                )
+            weekly_team_keys += self._transform_load_week_starters(
+                week, player_week_ids
+            )
+        db.set_league_week_watermark(
+            db_league.league_season_id, "weekly_starters", last_week, self.db
+        )
+        if weekly_team_keys:
+            self._bump_league_data_version()
+        return weekly_team_keys
 
-    def transform_load_player_week(self, season: int = None):
+    def transform_load_player_week(
+        self, season: int = None, full: bool = False
+    ) -> List[int]:
         """
         - Picks players off `players` table and uses ESPN API to determine weekly statistics
         - After this is done, you still need a separate ETL for D/ST and Kickers
+        - Only loads weeks past the league's `player_week` watermark, less the last
+          `etl_stat_correction_weeks` loaded weeks, whose corrected stats replace the
+          loaded ones. Every week is loaded when `full`
+        - Rescores the changed player weeks in every league of the season with
+          materialized points
+        Returns the ids of the player weeks inserted or changed
         """
-        BATCH_SIZE = 100
         league = self.espn_league
         season = season if season else league.year
+        db_league = self._get_existing_db_league(league)
+        watermark = (
+            0
+            if full
+            else db.get_league_week_watermark(
+                db_league.league_season_id, "player_week", self.db
+            )
+        )
+        # Weeks still in play are reloaded until they complete
+        first_week = max(watermark + 1 - config.etl_stat_correction_weeks, 1)
+        logger.info(f"Loading player weeks from week {first_week}")
         players = db.get_players_with_espn_id(offset=0, season=season, db=self.db)
         logger.info(f"Successfully {len(players)} retrieved players from db")
 
-        player_week_entries = []
-        for index, player in enumerate(players, 1):
-            player_season_id = [s for s in player.seasons if s.season == season][
+        espn_id_to_player_season_id = {
+            int(player.espn_id): [s for s in player.seasons if s.season == season][
                 0
             ].player_season_id
-            espn_id = int(player.espn_id)
-            player_info = league.player_info(playerId=espn_id)
-
-            for week in range(1, 19):
-                mapped_data = {}
-                if week not in player_info.stats:
-                    continue
-                for key, value in player_info.stats[week]["breakdown"].items():
-                    if key in utils.ESPN_PLAYER_STATS_TO_DB.keys():
-                        mapped_data[utils.ESPN_PLAYER_STATS_TO_DB[key]] = value
-                mapped_data.update(
-                    {
-                        "player_season_id": player_season_id,
-                        "week": week,
-                    }
-                )
-                player_week_entries.append(mapped_data)
-
-            if index % BATCH_SIZE == 0:
-                logger.info(f"Inserting weekly data for last {BATCH_SIZE} players")
-                db.bulk_insert(player_week_entries, PlayerWeekESPN, db=self.db)
-                player_week_entries = []
+            for player in players
+        }
+        # Fetched concurrently, loaded here as each batch arrives
+        fetched = 0
+        player_week_ids = []
+        for player_infos in self.extractor.iter_player_cards(
+            list(espn_id_to_player_season_id)
+        ):
+            player_week_entries = []
+            for player_info in player_infos:
+                player_season_id = espn_id_to_player_season_id[player_info.playerId]
+                for week in range(first_week, 19):
+                    if week not in player_info.stats:
+                        continue
+                    # Stats ESPN dropped in a correction are cleared, not kept
+                    mapped_data = dict.fromkeys(utils.ESPN_PLAYER_STATS_TO_DB.values())
+                    for key, value in player_info.stats[week]["breakdown"].items():
+                        if key in utils.ESPN_PLAYER_STATS_TO_DB.keys():
+                            mapped_data[utils.ESPN_PLAYER_STATS_TO_DB[key]] = value
+                    mapped_data.update(
+                        {
+                            "player_season_id": player_season_id,
+                            "week": week,
+                        }
+                    )
+                    player_week_entries.append(mapped_data)
 
-        if player_week_entries:
-            remaining_count = len(player_week_entries)
+            fetched += len(player_infos)
             logger.info(
-                f"Processing weekly data for final batch of {remaining_count} player weeks"
+                f"Inserting weekly data for {len(player_infos)} players "
+                f"(fetched {fetched} of {len(players)} total)"
             )
-            db.bulk_insert(player_week_entries, PlayerWeekESPN, db=self.db)
+            player_week_ids += db.bulk_upsert_player_weeks(player_week_entries, self.db)
+        db.set_league_week_watermark(
+            db_league.league_season_id,
+            "player_week",
+            self._last_completed_week(),
+            self.db,
+        )
+        logger.info(f"{len(player_week_ids)} player weeks inserted or changed")
+        if player_week_ids:
+            # Player weeks are shared, so every league of the season is now stale.
+            # Materialized points are read over the stats, so they're rescored
+            # before the bump lets lineup responses be cached again
+            for league_season in db.get_league_seasons_with_points(season, self.db):
+                self._score_league_points(league_season, player_week_ids)
+            db.bump_league_data_version(season, self.db)
+            if config.season_snapshot_dir:
+                season_store.write_season_snapshot(season, self.db)
+        return player_week_ids
+
+    def _score_league_points(
+        self, db_league: LeagueSeason, player_week_ids: List[int] = None
+    ) -> int:
+        """
+        - Materializes a league's fantasy points per player week into `league_player_week_points`
+        - Only player weeks with no points, points from an older scoring config, or
+          listed in `player_week_ids` are (re)scored
+        Returns the number of player weeks (re)scored
+        """
+        BATCH_SIZE = 1000
+        weights = scoring.compile_scoring_weights(db_league.scoring_config)
+        config_hash = scoring.scoring_config_hash(db_league.scoring_config)
+
+        rows = db.get_stale_league_player_weeks(
+            db_league.league_season_id,
+            db_league.season,
+            config_hash,
+            scoring.STAT_COLUMNS,
+            player_week_ids=player_week_ids,
+            db=self.db,
+        )
+        logger.info(
+            f"Found {len(rows)} player weeks to score for league season "
+            f"{db_league.league_season_id} points"
+        )
+
+        for start in range(0, len(rows), BATCH_SIZE):
+            batch = rows[start : start + BATCH_SIZE]
+            stats = np.nan_to_num(
+                np.array([row[1:] for row in batch], dtype=np.float64)
+            )
+            points = scoring.score_stat_matrix(stats, weights)
+            breakdowns = scoring.score_stat_matrix_by_category(stats, weights)
+            league_points_entries = [
+                {
+                    "league_season_id": db_league.league_season_id,
+                    "player_week_id": row[0],
+                    "points": float(points[index]),
+                    "points_breakdown": {
+                        category: float(value)
+                        for category, value in zip(
+                            scoring.SCORING_CATEGORIES, breakdowns[index]
+                        )
+                        if value
+                    },
+                    "scoring_config_hash": config_hash,
+                }
+                for index, row in enumerate(batch)
+            ]
+            logger.info(f"Upserting league points for {len(batch)} player weeks")
+            db.bulk_upsert_league_player_week_points(league_points_entries, self.db)
+        return len(rows)
+
+    def transform_load_league_points(self, player_week_ids: List[int] = None):
+        """
+        - Materializes this league's fantasy points, see `_score_league_points`
+        - `transform_load_player_week` already rescores the player weeks it changed
+        - Bumps the league's data version when any points were (re)scored
+        """
+        db_league = self._get_existing_db_league(self.espn_league)
+        if self._score_league_points(db_league, player_week_ids):
+            # Lineup responses cached before the rescore hold the old points
+            self._bump_league_data_version()
 
     def transform_load_player_season(self):
         """
@@ -381,7 +555,9 @@ if __name__ == "__main__":
         config.espn_league_id, 2024, config.espn_s2, config.espn_swid
     )
     espnTransformLoader.transform_load_weekly_starters()
+    espnTransformLoader.close()
     # espnTransformLoader.transform_load_player_week()
+    # espnTransformLoader.transform_load_league_points()
 
     # league = espnTransformLoader.espn_league
     # a = league.player_info(playerId=-16001)
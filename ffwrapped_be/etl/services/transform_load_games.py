@@ -12,7 +12,11 @@ logger = logging.getLogger(__name__)
 class GameTransformLoader():
   def __init__(self):
       self.extractor = WeeklyGameExtractor()
-      self.db = db.SessionLocal()
+      self.db = db.EtlSessionLocal()
+
+  def close(self):
+      self.db.close()
+      logger.info('Closed database session')
   
 
   def _get_season(self, date: str) -> str:
@@ -62,9 +66,9 @@ class GameTransformLoader():
       logger.info(f'Successfully inserted weekly game info in bulk!')
 
       db.commit(self.db)
-      self.db.close()
-      logger.info('Committed transaction and closed database session')
+      logger.info('Committed transaction')
 
 if __name__ == '__main__':
     game_transform_loader = GameTransformLoader()
-    game_transform_loader.transform_load()
\ No newline at end of file
+    game_transform_loader.transform_load()
+    game_transform_loader.close()
\ No newline at end of file
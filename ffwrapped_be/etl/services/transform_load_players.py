@@ -17,9 +17,13 @@ logger = logging.getLogger(__name__)
 class PlayerWeekTransformLoader:
     def __init__(self):
         self.extractor = WeeklyPlayerExtractor()
-        self.db = db.SessionLocal()
+        self.db = db.EtlSessionLocal()
         self.stathead_obs_per_page = 200
 
+    def close(self):
+        self.db.close()
+        logger.info("Closed database session")
+
     def _clear_data(self):
         logger.info("Clearing all existing player data")
         db.delete_all_rows(PlayerWeek, self.db)
@@ -176,5 +180,6 @@ if __name__ == "__main__":
     player_week_transform_loader = PlayerWeekTransformLoader()
     player_week_transform_loader._clear_data()
     player_week_transform_loader.etl_season(2024)
+    player_week_transform_loader.close()
     # player_week_transform_loader.etl_chunk(2024, 0)
     # player_week_transform_loader.etl_chunk(2024, 200)
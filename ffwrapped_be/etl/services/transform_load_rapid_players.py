@@ -11,7 +11,11 @@ logger = logging.getLogger(__name__)
 class RapidPlayerTransformLoader:
     def __init__(self):
         self.extractor = RapidTankExtractor()
-        self.db = db.SessionLocal()
+        self.db = db.EtlSessionLocal()
+
+    def close(self):
+        self.db.close()
+        logger.info("Closed database session")
 
     def load_players(self) -> List[Dict]:
         players_json = self.extractor.get_players()
@@ -43,3 +47,4 @@ class RapidPlayerTransformLoader:
 if __name__ == "__main__":
     rapidPlayerTransformLoader = RapidPlayerTransformLoader()
     players = rapidPlayerTransformLoader.load_players()
+    rapidPlayerTransformLoader.close()
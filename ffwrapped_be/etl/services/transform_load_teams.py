@@ -9,7 +9,11 @@ logger = logging.getLogger(__name__)
 class TeamTransformLoader():
     def __init__(self):
         self.extractor = TeamExtractor()
-        self.db = db.SessionLocal()
+        self.db = db.EtlSessionLocal()
+
+    def close(self):
+        self.db.close()
+        logger.info('Closed database session')
         
     def transform_load(self):
         team_data: List[Dict] = self.extractor.extract()
@@ -40,9 +44,9 @@ class TeamTransformLoader():
             logger.info(f'Successfully inserted team names for team {team.team_pfref_id} in bulk!')
         
         db.commit(self.db)
-        self.db.close()
-        logger.info('Committed transaction and closed database session')
+        logger.info('Committed transaction')
 
 if __name__ == '__main__':
     team_transform_loader = TeamTransformLoader()
-    team_transform_loader.transform_load()
\ No newline at end of file
+    team_transform_loader.transform_load()
+    team_transform_loader.close()
\ No newline at end of file